@@ -33,6 +33,17 @@ if errorlevel 1 (
     pip install -r requirements.txt
 )
 
+REM Great Circle 커널 AOT 빌드 (numba 설치 시 최초 1회 - JIT 워밍업 제거)
+python -c "import numba" 2>nul
+if not errorlevel 1 (
+    if not exist src\gc_kernels.* (
+        echo [정보] Great Circle 커널을 AOT 컴파일합니다...
+        pushd src
+        python _gc_kernels.py
+        popd
+    )
+)
+
 REM 시뮬레이터 실행
 echo.
 echo [정보] 시뮬레이터를 시작합니다...
@@ -36,6 +36,12 @@ if ! python3 -c "import streamlit" 2>/dev/null; then
     pip3 install -r requirements.txt
 fi
 
+# Great Circle 커널 AOT 빌드 (numba 설치 시 최초 1회 - JIT 워밍업 제거)
+if python3 -c "import numba" 2>/dev/null && ! ls src/gc_kernels.* >/dev/null 2>&1; then
+    echo "[정보] Great Circle 커널을 AOT 컴파일합니다..."
+    (cd src && python3 _gc_kernels.py)
+fi
+
 # 시뮬레이터 실행
 echo ""
 echo "[정보] 시뮬레이터를 시작합니다..."
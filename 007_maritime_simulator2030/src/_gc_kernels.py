@@ -0,0 +1,106 @@
+"""
+Great Circle Kernels
+=====================
+
+Great Circle 항법 내부 커널 (거리 / 방위각 / 중간 지점)
+
+로드 우선순위:
+1. AOT 컴파일된 gc_kernels 확장 모듈 (JIT 워밍업 없음)
+2. Numba @njit (첫 호출 시 컴파일, cache=True로 디스크 캐시)
+3. 순수 Python (numba 미설치 시)
+
+AOT 빌드 (빌드/설치 시 1회):
+    python _gc_kernels.py
+    → 같은 디렉토리에 gc_kernels.*.so (Windows: .pyd) 생성
+"""
+
+import math
+
+from numba_compat import njit
+from geo_constants import EARTH_RADIUS_KM, NAUTICAL_MILES_PER_KM
+
+
+@njit(cache=True)
+def angular_distance(lat1, lon1, lat2, lon2):
+    """Great Circle 각거리 (라디안, Haversine 형태)"""
+
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2) - math.radians(lon1)
+
+    a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
+
+    return 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+
+
+@njit(cache=True)
+def distance_nm(lat1, lon1, lat2, lon2):
+    """Great Circle 거리 (해리)"""
+    return angular_distance(lat1, lon1, lat2, lon2) * EARTH_RADIUS_KM * NAUTICAL_MILES_PER_KM
+
+
+@njit(cache=True)
+def bearing_deg(lat1, lon1, lat2, lon2):
+    """초기 방위각 (도, 0-360)"""
+
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlon = math.radians(lon2) - math.radians(lon1)
+
+    y = math.sin(dlon) * math.cos(lat2_rad)
+    x = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon)
+
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+
+@njit(cache=True)
+def intermediate_point(lat1, lon1, lat2, lon2, fraction, distance_rad):
+    """중간 지점 (위도, 경도) - distance_rad는 구간 각거리 (라디안)"""
+
+    lat1_rad = math.radians(lat1)
+    lon1_rad = math.radians(lon1)
+    lat2_rad = math.radians(lat2)
+    lon2_rad = math.radians(lon2)
+
+    # 각거리가 0에 가까우면 sin(δ)로 나눌 수 없으므로 선형 보간 계수 사용
+    if distance_rad < 1e-12:
+        a = 1 - fraction
+        b = fraction
+    else:
+        a = math.sin((1 - fraction) * distance_rad) / math.sin(distance_rad)
+        b = math.sin(fraction * distance_rad) / math.sin(distance_rad)
+
+    x = a * math.cos(lat1_rad) * math.cos(lon1_rad) + b * math.cos(lat2_rad) * math.cos(lon2_rad)
+    y = a * math.cos(lat1_rad) * math.sin(lon1_rad) + b * math.cos(lat2_rad) * math.sin(lon2_rad)
+    z = a * math.sin(lat1_rad) + b * math.sin(lat2_rad)
+
+    lat_rad = math.atan2(z, math.sqrt(x**2 + y**2))
+    lon_rad = math.atan2(y, x)
+
+    return math.degrees(lat_rad), math.degrees(lon_rad)
+
+
+# ============================================================================
+# AOT 빌드
+# ============================================================================
+
+if __name__ == "__main__":
+
+    import os
+    from numba.pycc import CC
+
+    cc = CC('gc_kernels')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # @njit 디스패처가 아닌 원본 Python 함수를 export
+    def _export(name, signature, func):
+        cc.export(name, signature)(getattr(func, 'py_func', func))
+
+    _export('angular_distance', 'f8(f8,f8,f8,f8)', angular_distance)
+    _export('distance_nm', 'f8(f8,f8,f8,f8)', distance_nm)
+    _export('bearing_deg', 'f8(f8,f8,f8,f8)', bearing_deg)
+    _export('intermediate_point', 'UniTuple(f8,2)(f8,f8,f8,f8,f8,f8)', intermediate_point)
+
+    cc.compile()
+    print(f"gc_kernels 빌드 완료: {cc.output_dir}")
@@ -39,7 +39,7 @@ from simulation_smr import (
     create_sample_geofences
 )
 from simulation_oceanic import get_oceanic_ships_predicted_positions
-from prediction_engine import DeadReckoningEngine
+from prediction_engine import DR_ENGINE
 from scenario_controller import (
     ScenarioController,
     ScenarioConfig,
@@ -565,9 +565,8 @@ def main():
 
                 # Dead Reckoning 오차 반경 (예시)
                 if vessel.data_source != "AIS":
-                    dr_engine = DeadReckoningEngine()
                     # 10분 경과 가정
-                    prediction = dr_engine.predict_position(
+                    prediction = DR_ENGINE.predict_position(
                         last_latitude=vessel.latitude,
                         last_longitude=vessel.longitude,
                         course_deg=vessel.course,
@@ -813,7 +812,7 @@ def main():
         st.subheader("항로 이탈 및 위반 이벤트")
 
         if st.session_state.smr_vessel:
-            violations = st.session_state.smr_vessel.get_violation_log()
+            violations = st.session_state.smr_vessel.get_violation_log(last_n=20)
 
             if violations:
                 event_data = []
@@ -0,0 +1,11 @@
+"""
+Geodesy Constants
+==================
+
+항로 / Great Circle 계산 공용 상수 (의존성 없는 순수 모듈)
+
+커널 모듈(_gc_kernels / AOT gc_kernels)을 로드하지 않고도 상수만 가져올 수 있도록 분리
+"""
+
+EARTH_RADIUS_KM = 6371.0
+NAUTICAL_MILES_PER_KM = 0.539957
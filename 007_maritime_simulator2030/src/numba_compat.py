@@ -0,0 +1,34 @@
+"""
+Numba Compatibility Layer
+==========================
+
+numba가 설치되어 있으면 JIT 데코레이터를 그대로 사용하고,
+설치되어 있지 않으면 순수 Python으로 동작하는 대체 구현을 제공합니다.
+
+사용 예:
+    from numba_compat import njit, prange
+
+    @njit(cache=True)
+    def kernel(x): ...
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+
+except ImportError:  # numba 미설치 → 순수 Python 폴백
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba.njit 대체 데코레이터 (함수를 그대로 반환)"""
+
+        # @njit 형태 (인자 없이 사용)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        # @njit(cache=True, ...) 형태
+        def decorator(func):
+            return func
+
+        return decorator
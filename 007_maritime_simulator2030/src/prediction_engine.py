@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import math
 
+from numba_compat import njit
+
 
 # 지구 반경 (미터)
 EARTH_RADIUS_M = 6371000.0
@@ -23,10 +25,126 @@ EARTH_RADIUS_M = 6371000.0
 # AIS Class A 센서 정확도 (미터)
 AIS_SENSOR_ACCURACY = 10.0
 
+# Dead Reckoning 기본 계수
+DEFAULT_COURSE_UNCERTAINTY_DEG = 2.0    # 침로 불확실성 (도)
+DEFAULT_SPEED_UNCERTAINTY_KNOTS = 0.1   # 속도 불확실성 (노트)
+DEFAULT_WIND_DRIFT_COEF = 0.03          # 바람 드리프트 계수
+DEFAULT_CURRENT_DRIFT_COEF = 1.0        # 해류 드리프트 계수
+
 # 각도 변환 상수
 DEG_TO_RAD = np.pi / 180.0
 RAD_TO_DEG = 180.0 / np.pi
 
+# calculate_distance_haversine에서 배열 커널로 보낼 입력 타입
+_ARRAY_TYPES = (np.ndarray, list, tuple)
+
+
+# ============================================================================
+# Haversine 커널 (Numba JIT, 미설치 시 순수 Python)
+# ============================================================================
+
+@njit(cache=True, fastmath=True)
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine 거리 (미터) - 스칼라"""
+    lat1_rad = lat1 * DEG_TO_RAD
+    lat2_rad = lat2 * DEG_TO_RAD
+    delta_lat = (lat2 - lat1) * DEG_TO_RAD
+    delta_lon = (lon2 - lon1) * DEG_TO_RAD
+
+    a = (
+        math.sin(delta_lat / 2)**2 +
+        math.cos(lat1_rad) * math.cos(lat2_rad) *
+        math.sin(delta_lon / 2)**2
+    )
+
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+@njit(cache=True, fastmath=True)
+def haversine_m_array(
+    lat1: np.ndarray, lon1: np.ndarray,
+    lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Haversine 거리 (미터) - 배열 (같은 길이의 좌표 배열 쌍)"""
+    n = lat1.shape[0]
+    out = np.empty(n, dtype=np.float64)
+
+    for i in range(n):
+        out[i] = haversine_m(lat1[i], lon1[i], lat2[i], lon2[i])
+
+    return out
+
+
+@njit(cache=True)
+def dead_reckon(
+    lat: float, lon: float,
+    course_deg: float, speed_knots: float, dt: float,
+    drift_east_ms: float, drift_north_ms: float
+) -> Tuple[float, float]:
+    """Dead Reckoning 위치만 계산 (predict_position의 1~2단계, 오차 반경 계산 생략)
+
+    Args:
+        drift_east_ms, drift_north_ms: 바람+해류 드리프트 속도 (m/s)
+
+    Returns:
+        (위도, 경도)
+    """
+    angular = speed_knots * 0.514444 * dt / EARTH_RADIUS_M
+    lat1_rad = lat * DEG_TO_RAD
+    course_rad = course_deg * DEG_TO_RAD
+
+    lat2_rad = math.asin(
+        math.sin(lat1_rad) * math.cos(angular) +
+        math.cos(lat1_rad) * math.sin(angular) * math.cos(course_rad)
+    )
+    lon2_rad = lon * DEG_TO_RAD + math.atan2(
+        math.sin(course_rad) * math.sin(angular) * math.cos(lat1_rad),
+        math.cos(angular) - math.sin(lat1_rad) * math.sin(lat2_rad)
+    )
+
+    new_lat = lat2_rad * RAD_TO_DEG
+    new_lon = ((lon2_rad * RAD_TO_DEG + 180) % 360) - 180
+
+    # 환경 드리프트
+    if drift_east_ms != 0.0 or drift_north_ms != 0.0:
+        new_lat_rad = new_lat * DEG_TO_RAD
+        new_lat += drift_north_ms * dt / EARTH_RADIUS_M * RAD_TO_DEG
+        new_lon += drift_east_ms * dt / (EARTH_RADIUS_M * math.cos(new_lat_rad)) * RAD_TO_DEG
+
+    return new_lat, new_lon
+
+
+def drift_velocity(
+    wind_speed_knots: Optional[float],
+    wind_direction_deg: Optional[float],
+    current_speed_knots: Optional[float],
+    current_direction_deg: Optional[float],
+    wind_drift_coef: float = DEFAULT_WIND_DRIFT_COEF,
+    current_drift_coef: float = DEFAULT_CURRENT_DRIFT_COEF
+) -> Tuple[float, float]:
+    """바람+해류 드리프트 속도 (동, 북 m/s) - dead_reckon의 드리프트 인자
+
+    풍속/풍향 또는 해류 속도/방향이 None이면 해당 성분은 0
+    """
+
+    east = 0.0
+    north = 0.0
+
+    if wind_speed_knots is not None and wind_direction_deg is not None:
+        # 바람이 불어오는 방향 → 불어가는 방향
+        wind_ms = wind_speed_knots * 0.514444 * wind_drift_coef
+        drift_rad = (wind_direction_deg + 180) * DEG_TO_RAD
+        east += wind_ms * math.sin(drift_rad)
+        north += wind_ms * math.cos(drift_rad)
+
+    if current_speed_knots is not None and current_direction_deg is not None:
+        current_ms = current_speed_knots * 0.514444 * current_drift_coef
+        current_rad = current_direction_deg * DEG_TO_RAD
+        east += current_ms * math.sin(current_rad)
+        north += current_ms * math.cos(current_rad)
+
+    return east, north
+
 
 @dataclass
 class PredictionResult:
@@ -71,10 +189,10 @@ class DeadReckoningEngine:
 
     def __init__(
         self,
-        course_uncertainty_deg: float = 2.0,  # 침로 불확실성 (도)
-        speed_uncertainty_knots: float = 0.1,  # 속도 불확실성 (노트)
-        wind_drift_coefficient: float = 0.03,  # 바람 드리프트 계수
-        current_drift_coefficient: float = 1.0  # 해류 드리프트 계수
+        course_uncertainty_deg: float = DEFAULT_COURSE_UNCERTAINTY_DEG,
+        speed_uncertainty_knots: float = DEFAULT_SPEED_UNCERTAINTY_KNOTS,
+        wind_drift_coefficient: float = DEFAULT_WIND_DRIFT_COEF,
+        current_drift_coefficient: float = DEFAULT_CURRENT_DRIFT_COEF
     ):
         """
         Args:
@@ -154,96 +272,46 @@ class DeadReckoningEngine:
         """
 
         # ===================================================================
-        # 1. 기본 Dead Reckoning (바람/해류 없이)
+        # 1. 환경 드리프트 속도 (바람, 해류)
         # ===================================================================
 
         # 노트를 m/s로 변환 (1 knot = 0.514444 m/s)
         speed_ms = speed_knots * 0.514444
 
-        # 이동 거리 계산 (미터)
+        # 이동 거리 계산 (미터) - 오차 반경 계산에 사용
         distance_traveled_m = speed_ms * time_elapsed_seconds
 
-        # 각거리 계산 (라디안)
-        angular_distance = distance_traveled_m / EARTH_RADIUS_M
-
-        # 위도/경도를 라디안으로 변환
-        lat1_rad = last_latitude * DEG_TO_RAD
-        lon1_rad = last_longitude * DEG_TO_RAD
-
-        # 침로를 라디안으로 변환 (북쪽 기준)
-        course_rad = course_deg * DEG_TO_RAD
-
-        # 대권항법 공식으로 새 위치 계산
-        lat2_rad = np.arcsin(
-            np.sin(lat1_rad) * np.cos(angular_distance) +
-            np.cos(lat1_rad) * np.sin(angular_distance) * np.cos(course_rad)
+        # 바람 / 해류 성분을 따로 계산 (결과에 성분별 드리프트 거리 기록)
+        wind_east, wind_north = drift_velocity(
+            wind_speed_knots, wind_direction_deg, None, None,
+            self.wind_drift_coef, self.current_drift_coef
         )
-
-        lon2_rad = lon1_rad + np.arctan2(
-            np.sin(course_rad) * np.sin(angular_distance) * np.cos(lat1_rad),
-            np.cos(angular_distance) - np.sin(lat1_rad) * np.sin(lat2_rad)
+        current_east, current_north = drift_velocity(
+            None, None, current_speed_knots, current_direction_deg,
+            self.wind_drift_coef, self.current_drift_coef
         )
 
-        # 라디안을 도로 변환
-        predicted_lat = lat2_rad * RAD_TO_DEG
-        predicted_lon = lon2_rad * RAD_TO_DEG
-
-        # 경도 정규화 (-180 ~ 180)
-        predicted_lon = ((predicted_lon + 180) % 360) - 180
-
-        # ===================================================================
-        # 2. 환경 드리프트 추가 (바람, 해류)
-        # ===================================================================
-
         wind_drift_m = None
         current_drift_m = None
 
-        total_drift_east_m = 0.0
-        total_drift_north_m = 0.0
-
-        # 바람 드리프트 계산
         if wind_speed_knots is not None and wind_direction_deg is not None:
-            wind_ms = wind_speed_knots * 0.514444
-            wind_drift_speed = wind_ms * self.wind_drift_coef
-
-            # 바람 방향 (기상학적: 바람이 불어오는 방향)
-            # → 드리프트 방향으로 변환 (바람이 불어가는 방향)
-            drift_direction_rad = (wind_direction_deg + 180) * DEG_TO_RAD
+            wind_drift_m = (wind_east * time_elapsed_seconds, wind_north * time_elapsed_seconds)
 
-            drift_east = wind_drift_speed * np.sin(drift_direction_rad) * time_elapsed_seconds
-            drift_north = wind_drift_speed * np.cos(drift_direction_rad) * time_elapsed_seconds
-
-            total_drift_east_m += drift_east
-            total_drift_north_m += drift_north
-
-            wind_drift_m = (drift_east, drift_north)
-
-        # 해류 드리프트 계산
         if current_speed_knots is not None and current_direction_deg is not None:
-            current_ms = current_speed_knots * 0.514444 * self.current_drift_coef
-
-            current_rad = current_direction_deg * DEG_TO_RAD
+            current_drift_m = (current_east * time_elapsed_seconds, current_north * time_elapsed_seconds)
 
-            drift_east = current_ms * np.sin(current_rad) * time_elapsed_seconds
-            drift_north = current_ms * np.cos(current_rad) * time_elapsed_seconds
+        drift_east_ms = wind_east + current_east
+        drift_north_ms = wind_north + current_north
 
-            total_drift_east_m += drift_east
-            total_drift_north_m += drift_north
-
-            current_drift_m = (drift_east, drift_north)
-
-        # 드리프트를 위도/경도 오프셋으로 변환
-        if total_drift_east_m != 0.0 or total_drift_north_m != 0.0:
-            # 위도 오프셋 (미터 → 도)
-            lat_offset = total_drift_north_m / EARTH_RADIUS_M * RAD_TO_DEG
-
-            # 경도 오프셋 (위도에 따라 조정)
-            lon_offset = total_drift_east_m / (
-                EARTH_RADIUS_M * np.cos(predicted_lat * DEG_TO_RAD)
-            ) * RAD_TO_DEG
+        # ===================================================================
+        # 2. 대권항법 + 드리프트 오프셋 (dead_reckon 커널)
+        # ===================================================================
 
-            predicted_lat += lat_offset
-            predicted_lon += lon_offset
+        predicted_lat, predicted_lon = dead_reckon(
+            last_latitude, last_longitude,
+            course_deg, speed_knots, time_elapsed_seconds,
+            drift_east_ms, drift_north_ms
+        )
 
         # ===================================================================
         # 3. 오차 반경 계산
@@ -311,6 +379,7 @@ class DeadReckoningEngine:
     ) -> float:
         """
         Haversine 공식을 사용하여 두 지점 간 거리를 계산합니다.
+        (좌표가 배열이면 브로드캐스트 후 같은 모양의 거리 배열 반환)
 
         공식:
         -----
@@ -325,22 +394,20 @@ class DeadReckoningEngine:
         Returns:
             거리 (미터)
         """
-        lat1_rad = lat1 * DEG_TO_RAD
-        lat2_rad = lat2 * DEG_TO_RAD
-        delta_lat = (lat2 - lat1) * DEG_TO_RAD
-        delta_lon = (lon2 - lon1) * DEG_TO_RAD
-
-        a = (
-            np.sin(delta_lat / 2)**2 +
-            np.cos(lat1_rad) * np.cos(lat2_rad) *
-            np.sin(delta_lon / 2)**2
-        )
-
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
-
-        distance_m = EARTH_RADIUS_M * c
-
-        return distance_m
+        # 배열 입력은 배열 커널로 (스칼라 경로는 그대로)
+        if (
+            isinstance(lat1, _ARRAY_TYPES) or isinstance(lon1, _ARRAY_TYPES) or
+            isinstance(lat2, _ARRAY_TYPES) or isinstance(lon2, _ARRAY_TYPES)
+        ):
+            lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+                *(np.asarray(v, dtype=np.float64) for v in (lat1, lon1, lat2, lon2))
+            )
+            shape = lat1.shape
+            return haversine_m_array(
+                *(np.ascontiguousarray(v).ravel() for v in (lat1, lon1, lat2, lon2))
+            ).reshape(shape)
+
+        return haversine_m(lat1, lon1, lat2, lon2)
 
     @staticmethod
     def calculate_bearing(
@@ -418,6 +485,10 @@ class DeadReckoningEngine:
         }
 
 
+# 기본 계수 공용 엔진 - 시뮬레이터 / 대시보드가 인스턴스를 따로 만들지 않고 공유
+DR_ENGINE = DeadReckoningEngine()
+
+
 # ============================================================================
 # 사용 예시
 # ============================================================================
@@ -0,0 +1,69 @@
+"""
+Route Geometry
+===============
+
+시뮬레이터 공용 항로 데이터 구조
+
+- Waypoint: 항로 웨이포인트 (암모니아 / 대양 시뮬레이터 공용)
+- RouteGeometry: 구간별 각거리 / 거리 / 방위각 사전 계산 캐시
+"""
+
+from dataclasses import dataclass
+from typing import Sequence
+import numpy as np
+
+from geo_constants import EARTH_RADIUS_KM, NAUTICAL_MILES_PER_KM
+
+# Great Circle 커널: AOT 컴파일 모듈이 있으면 사용 (없으면 Numba JIT / 순수 Python)
+try:
+    import gc_kernels as _gc
+except ImportError:
+    import _gc_kernels as _gc
+
+
+@dataclass(frozen=True, slots=True)
+class Waypoint:
+    """항로 웨이포인트"""
+    latitude: float
+    longitude: float
+    name: str = ""
+    arrival_speed_knots: float = 15.0  # 도착 시 목표 속도 (암모니아 시뮬레이터)
+
+
+class RouteGeometry:
+    """
+    항로 기하 정보 캐시
+
+    웨이포인트 좌표와 구간별 Great Circle 값을 생성 시 한 번만 계산합니다.
+    (구간 i = waypoints[i] → waypoints[i+1])
+    """
+
+    def __init__(self, waypoints: Sequence[Waypoint]):
+        self.waypoints = tuple(waypoints)
+
+        self.lats = np.array([wp.latitude for wp in self.waypoints], dtype=np.float64)
+        self.lons = np.array([wp.longitude for wp in self.waypoints], dtype=np.float64)
+
+        legs = list(zip(self.waypoints[:-1], self.waypoints[1:]))
+
+        # 구간별 각거리 (라디안) / 거리 (해리) / 초기 방위각 (도)
+        self.leg_delta_rad = np.array([
+            _gc.angular_distance(wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude)
+            for wp1, wp2 in legs
+        ], dtype=np.float64)
+        self.leg_nm = self.leg_delta_rad * (EARTH_RADIUS_KM * NAUTICAL_MILES_PER_KM)
+        self.bearings = np.array([
+            _gc.bearing_deg(wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude)
+            for wp1, wp2 in legs
+        ], dtype=np.float64)
+
+        # 누적 거리 (해리) - cum_nm[i] = 구간 i 종료 지점까지의 거리
+        self.cum_nm = np.cumsum(self.leg_nm)
+
+    @property
+    def n_legs(self) -> int:
+        return len(self.leg_nm)
+
+    @property
+    def total_nm(self) -> float:
+        return float(self.cum_nm[-1]) if self.n_legs else 0.0
@@ -12,34 +12,37 @@ Ammonia Vessel Simulation
 - 풍향/해류 영향 모델링
 """
 
-import numpy as np
+import math
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
 import random
+import numpy as np
 from ais_client import VesselState
-from prediction_engine import DeadReckoningEngine
+from prediction_engine import DR_ENGINE as _DR, EARTH_RADIUS_M, dead_reckon, drift_velocity
+from numba_compat import njit, prange
+from _gc_kernels import angular_distance, bearing_deg
+from routes import Waypoint, RouteGeometry
 
 
 # 실험용 MMSI 범위 (9XX XXX XXX)
 AMMONIA_MMSI_BASE = 900000000
 
-
-@dataclass
-class Waypoint:
-    """항로 웨이포인트"""
-    latitude: float
-    longitude: float
-    name: str = ""
-    arrival_speed_knots: float = 15.0  # 도착 시 목표 속도
+# 기동 성능 한계
+MAX_ACCELERATION_KNOTS_PER_SEC = 0.05  # 0.05 knots/sec
+MAX_TURN_RATE_DEG_PER_SEC = 2.0  # 2도/초
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Route:
     """선박 항로"""
-    waypoints: List[Waypoint]
+    waypoints: Tuple[Waypoint, ...]
     route_name: str = "Unnamed Route"
 
+    def __post_init__(self):
+        object.__setattr__(self, 'waypoints', tuple(self.waypoints))
+
     def get_total_waypoints(self) -> int:
         return len(self.waypoints)
 
@@ -88,6 +91,10 @@ class AmmoniaVesselSimulator:
         self.config = config
         self.update_interval = update_interval_sec
 
+        # update_interval 기준 스텝당 최대 속도/침로 변화량 (기본 경로에서 재사용)
+        self._max_speed_change = MAX_ACCELERATION_KNOTS_PER_SEC * update_interval_sec
+        self._max_course_change = MAX_TURN_RATE_DEG_PER_SEC * update_interval_sec
+
         # MMSI 생성 (실험용 범위)
         self.mmsi = str(AMMONIA_MMSI_BASE + config.vessel_id)
 
@@ -103,8 +110,8 @@ class AmmoniaVesselSimulator:
         self.blackout_start_time: Optional[datetime] = None
         self.blackout_duration_sec: int = 0
 
-        # Dead Reckoning 엔진
-        self.dr_engine = DeadReckoningEngine()
+        # Dead Reckoning 엔진 (모듈 공용 인스턴스)
+        self.dr_engine = _DR
 
         # 초기 위치를 첫 웨이포인트로 설정
         self._initialize_position()
@@ -244,13 +251,19 @@ class AmmoniaVesselSimulator:
         else:
             target_speed = self.config.cruise_speed_knots
 
+        # 스텝당 최대 변화량 (dt가 update_interval과 다를 때만 재계산)
+        if dt == self.update_interval:
+            max_speed_change = self._max_speed_change
+            max_course_change = self._max_course_change
+        else:
+            max_speed_change = MAX_ACCELERATION_KNOTS_PER_SEC * dt
+            max_course_change = MAX_TURN_RATE_DEG_PER_SEC * dt
+
         # 현재 속도를 목표 속도로 점진적 조정 (가속도 제한)
-        max_acceleration_knots_per_sec = 0.05  # 0.05 knots/sec
         speed_diff = target_speed - self.vessel_state.speed
-        max_speed_change = max_acceleration_knots_per_sec * dt
 
         if abs(speed_diff) > max_speed_change:
-            self.vessel_state.speed += np.sign(speed_diff) * max_speed_change
+            self.vessel_state.speed += math.copysign(max_speed_change, speed_diff)
         else:
             self.vessel_state.speed = target_speed
 
@@ -258,18 +271,18 @@ class AmmoniaVesselSimulator:
         # 5. 침로 조정 (선회율 제한)
         # ===================================================================
 
-        max_turn_rate_deg_per_sec = 2.0  # 2도/초
-
-        course_diff = (target_course - self.vessel_state.course + 180) % 360 - 180
-        max_course_change = max_turn_rate_deg_per_sec * dt
+        # 최단 회전 방향 차이 (-180 ~ 180): 나눗셈 1회 + 반올림, 분기 없음
+        course_diff = target_course - self.vessel_state.course
+        course_diff -= 360.0 * round(course_diff / 360.0)
 
         if abs(course_diff) > max_course_change:
-            self.vessel_state.course += np.sign(course_diff) * max_course_change
+            self.vessel_state.course += math.copysign(max_course_change, course_diff)
         else:
             self.vessel_state.course = target_course
 
         # 침로 정규화 (0-360)
-        self.vessel_state.course = self.vessel_state.course % 360
+        course = self.vessel_state.course
+        self.vessel_state.course = course - 360.0 * math.floor(course / 360.0)
         self.vessel_state.heading = self.vessel_state.course
 
         # ===================================================================
@@ -337,6 +350,266 @@ class AmmoniaVesselSimulator:
             return {'in_blackout': False}
 
 
+# ============================================================================
+# 함대 일괄 시뮬레이션 (SoA 배열 + 병렬 커널)
+# ============================================================================
+
+@njit(inline='always')
+def _step_vessel(
+    i, lats, lons, speeds, courses, wp_idx,
+    route_offsets, route_lats, route_lons, route_arrival_speeds,
+    cruise_speeds, min_speeds,
+    drift_east_ms, drift_north_ms,
+    dt, max_speed_change, max_course_change
+):
+    """선박 i를 한 스텝 진행 (AmmoniaVesselSimulator.step과 동일한 로직, 배열 제자리 갱신)"""
+
+    start = route_offsets[i]
+    n_wp = route_offsets[i + 1] - start
+
+    if wp_idx[i] >= n_wp:
+        wp_idx[i] = 0
+
+    t = start + wp_idx[i]
+    target_lat = route_lats[t]
+    target_lon = route_lons[t]
+
+    target_course = bearing_deg(lats[i], lons[i], target_lat, target_lon)
+    distance_to_target = angular_distance(lats[i], lons[i], target_lat, target_lon) * EARTH_RADIUS_M
+
+    # 속도 프로파일 (마지막 5km 선형 감속)
+    if distance_to_target < 5000.0:
+        speed_factor = distance_to_target / 5000.0
+        target_speed = min_speeds[i] + (route_arrival_speeds[t] - min_speeds[i]) * speed_factor
+    else:
+        target_speed = cruise_speeds[i]
+
+    speed_diff = target_speed - speeds[i]
+    if abs(speed_diff) > max_speed_change:
+        speeds[i] += math.copysign(max_speed_change, speed_diff)
+    else:
+        speeds[i] = target_speed
+
+    # 침로 조정 (선회율 제한)
+    course_diff = target_course - courses[i]
+    course_diff -= 360.0 * round(course_diff / 360.0)
+    if abs(course_diff) > max_course_change:
+        courses[i] += math.copysign(max_course_change, course_diff)
+    else:
+        courses[i] = target_course
+    courses[i] -= 360.0 * math.floor(courses[i] / 360.0)
+
+    # Dead Reckoning (대권항법 + 환경 드리프트)
+    new_lat, new_lon = dead_reckon(
+        lats[i], lons[i], courses[i], speeds[i], dt, drift_east_ms[i], drift_north_ms[i]
+    )
+
+    lats[i] = new_lat
+    lons[i] = new_lon
+
+    # 웨이포인트 도달 (500m 이내)
+    if distance_to_target < 500.0:
+        wp_idx[i] += 1
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _step_fleet(
+    lats, lons, speeds, courses, wp_idx,
+    route_offsets, route_lats, route_lons, route_arrival_speeds,
+    cruise_speeds, min_speeds,
+    drift_east_ms, drift_north_ms,
+    dt
+):
+    """함대 전체를 한 스텝 진행 (선박별 독립 → prange 병렬)
+
+    AmmoniaVesselSimulator.step의 항로 추종/속도/침로/Dead Reckoning 로직과 동일하며,
+    배열은 제자리(in-place)에서 갱신됩니다. 블랙아웃 난수는 커널 밖에서 처리합니다.
+
+    Args:
+        route_offsets: 선박 i의 웨이포인트는 route_*[route_offsets[i]:route_offsets[i+1]]
+        drift_east_ms, drift_north_ms: 바람+해류 드리프트 속도 (m/s)
+    """
+
+    max_speed_change = MAX_ACCELERATION_KNOTS_PER_SEC * dt
+    max_course_change = MAX_TURN_RATE_DEG_PER_SEC * dt
+
+    for i in prange(lats.shape[0]):
+        _step_vessel(
+            i, lats, lons, speeds, courses, wp_idx,
+            route_offsets, route_lats, route_lons, route_arrival_speeds,
+            cruise_speeds, min_speeds,
+            drift_east_ms, drift_north_ms,
+            dt, max_speed_change, max_course_change
+        )
+
+
+@lru_cache(maxsize=None)
+def make_step_kernel(dt: float):
+    """dt 고정 함대 커널 생성 (dt에 비례하는 항을 컴파일 타임 상수로 접음)
+
+    반환된 커널은 _step_fleet과 같은 인자를 받되 dt만 제외합니다.
+    dt별로 한 번만 생성/컴파일됩니다.
+    """
+
+    dt = float(dt)
+    max_speed_change = MAX_ACCELERATION_KNOTS_PER_SEC * dt
+    max_course_change = MAX_TURN_RATE_DEG_PER_SEC * dt
+
+    @njit(parallel=True, fastmath=True)
+    def step_fleet_fixed_dt(
+        lats, lons, speeds, courses, wp_idx,
+        route_offsets, route_lats, route_lons, route_arrival_speeds,
+        cruise_speeds, min_speeds,
+        drift_east_ms, drift_north_ms
+    ):
+        for i in prange(lats.shape[0]):
+            _step_vessel(
+                i, lats, lons, speeds, courses, wp_idx,
+                route_offsets, route_lats, route_lons, route_arrival_speeds,
+                cruise_speeds, min_speeds,
+                drift_east_ms, drift_north_ms,
+                dt, max_speed_change, max_course_change
+            )
+
+    return step_fleet_fixed_dt
+
+
+class AmmoniaFleetSimulator:
+    """
+    암모니아 함대 일괄 시뮬레이터
+
+    개별 AmmoniaVesselSimulator의 상태를 SoA(Structure of Arrays) 배열로 묶어
+    함대 전체를 하나의 병렬 커널 호출로 진행합니다.
+    """
+
+    def __init__(self, simulators: List[AmmoniaVesselSimulator], seed: Optional[int] = None):
+        """
+        Args:
+            simulators: 묶을 선박 시뮬레이터 리스트 (예: create_ammonia_fleet())
+            seed: 블랙아웃 난수 시드
+        """
+        self.simulators = simulators
+        self.update_interval = simulators[0].update_interval if simulators else 10
+        self.simulation_time = datetime.utcnow()
+
+        # 선박 상태 (SoA)
+        self.lats = np.array([sim.vessel_state.latitude for sim in simulators], dtype=np.float64)
+        self.lons = np.array([sim.vessel_state.longitude for sim in simulators], dtype=np.float64)
+        self.speeds = np.array([sim.vessel_state.speed for sim in simulators], dtype=np.float64)
+        self.courses = np.array([sim.vessel_state.course for sim in simulators], dtype=np.float64)
+        self.wp_idx = np.array([sim.current_waypoint_idx for sim in simulators], dtype=np.int64)
+
+        # 선박 성능
+        configs = [sim.config for sim in simulators]
+        self.cruise_speeds = np.array([c.cruise_speed_knots for c in configs], dtype=np.float64)
+        self.min_speeds = np.array([c.min_speed_knots for c in configs], dtype=np.float64)
+
+        # 항로 (선박별 웨이포인트를 하나의 배열로 연결)
+        geometries = [RouteGeometry(c.route.waypoints) for c in configs]
+        self.route_offsets = np.cumsum([0] + [len(g.lats) for g in geometries]).astype(np.int64)
+        self.route_lats = np.concatenate([g.lats for g in geometries])
+        self.route_lons = np.concatenate([g.lons for g in geometries])
+        self.route_arrival_speeds = np.array(
+            [wp.arrival_speed_knots for g in geometries for wp in g.waypoints], dtype=np.float64
+        )
+
+        # 블랙아웃 (난수는 커널 밖에서 생성)
+        self._rng = np.random.default_rng(seed)
+        self.blackout_probs = np.array([c.signal_blackout_probability for c in configs], dtype=np.float64)
+        self.blackout_min_sec = np.array([c.blackout_min_duration_sec for c in configs], dtype=np.int64)
+        self.blackout_max_sec = np.array([c.blackout_max_duration_sec for c in configs], dtype=np.int64)
+        self.in_blackout = np.zeros(len(simulators), dtype=np.bool_)
+        self.blackout_remaining_sec = np.zeros(len(simulators), dtype=np.float64)
+
+        # Dead Reckoning 드리프트 계수 (공용 엔진과 동일)
+        self.wind_drift_coef = _DR.wind_drift_coef
+        self.current_drift_coef = _DR.current_drift_coef
+
+        # update_interval 고정 커널 (기본 경로)
+        self._step_kernel = make_step_kernel(self.update_interval)
+
+    def _update_blackouts(self, dt: float):
+        """블랙아웃 상태 갱신 (벡터화)"""
+
+        self.blackout_remaining_sec[self.in_blackout] -= dt
+        self.in_blackout &= self.blackout_remaining_sec > 0
+        self.blackout_remaining_sec[~self.in_blackout] = 0.0
+
+        draws = self._rng.random(len(self.in_blackout))
+        new_blackout = ~self.in_blackout & (draws < self.blackout_probs)
+
+        if new_blackout.any():
+            durations = self._rng.integers(self.blackout_min_sec, self.blackout_max_sec + 1)
+            self.blackout_remaining_sec[new_blackout] = durations[new_blackout]
+            self.in_blackout |= new_blackout
+
+    def step(
+        self,
+        delta_time_sec: Optional[int] = None,
+        wind_speed_knots: Optional[float] = None,
+        wind_direction_deg: Optional[float] = None,
+        current_speed_knots: Optional[float] = None,
+        current_direction_deg: Optional[float] = None
+    ):
+        """
+        함대 전체를 한 스텝 진행합니다. (환경 조건은 전 선박 공통)
+
+        Args:
+            delta_time_sec: 시간 증분 (None이면 update_interval 사용)
+            wind_speed_knots: 풍속 (노트)
+            wind_direction_deg: 풍향 (도)
+            current_speed_knots: 해류 속도 (노트)
+            current_direction_deg: 해류 방향 (도)
+        """
+
+        dt = delta_time_sec or self.update_interval
+        self.simulation_time += timedelta(seconds=dt)
+
+        self._update_blackouts(dt)
+
+        east, north = drift_velocity(
+            wind_speed_knots, wind_direction_deg,
+            current_speed_knots, current_direction_deg,
+            self.wind_drift_coef, self.current_drift_coef
+        )
+        drift_east = np.full(len(self.lats), east)
+        drift_north = np.full(len(self.lats), north)
+
+        arrays = (
+            self.lats, self.lons, self.speeds, self.courses, self.wp_idx,
+            self.route_offsets, self.route_lats, self.route_lons, self.route_arrival_speeds,
+            self.cruise_speeds, self.min_speeds,
+            drift_east, drift_north
+        )
+
+        if dt == self.update_interval:
+            self._step_kernel(*arrays)
+        else:
+            _step_fleet(*arrays, float(dt))
+
+    def sync_states(self) -> List[VesselState]:
+        """배열 상태를 각 시뮬레이터의 VesselState에 반영하고 반환"""
+
+        states = []
+
+        for i, sim in enumerate(self.simulators):
+            state = sim.vessel_state
+            state.latitude = float(self.lats[i])
+            state.longitude = float(self.lons[i])
+            state.speed = float(self.speeds[i])
+            state.course = float(self.courses[i])
+            state.heading = state.course
+            state.timestamp = self.simulation_time
+
+            sim.current_waypoint_idx = int(self.wp_idx[i])
+            sim.simulation_time = self.simulation_time
+            sim.in_blackout = bool(self.in_blackout[i])
+
+            states.append(state)
+
+        return states
+
+
 # ============================================================================
 # 사전 정의된 항로
 # ============================================================================
@@ -476,8 +749,35 @@ def create_ammonia_fleet() -> List[AmmoniaVesselSimulator]:
 
 if __name__ == "__main__":
 
+    import os
+    import sys
     import time
 
+    # SIM_VERBOSE=1 이면 스텝별 상세 출력 + 출력 딜레이
+    VERBOSE = os.environ.get("SIM_VERBOSE", "0") == "1"
+
+    if "--bench" in sys.argv:
+        # 벤치마크: 함대 스텝 커널 처리량 측정 (출력/딜레이 없음)
+        N_STEPS = 100_000
+
+        fleet_sim = AmmoniaFleetSimulator(create_ammonia_fleet(), seed=0)
+        n_vessels = len(fleet_sim.lats)
+
+        # JIT 컴파일 비용은 측정에서 제외 (워밍업)
+        fleet_sim.step(wind_speed_knots=15.0, wind_direction_deg=270.0,
+                       current_speed_knots=1.5, current_direction_deg=180.0)
+
+        start = time.perf_counter()
+        for _ in range(N_STEPS):
+            fleet_sim.step(wind_speed_knots=15.0, wind_direction_deg=270.0,
+                           current_speed_knots=1.5, current_direction_deg=180.0)
+        elapsed = time.perf_counter() - start
+
+        print(f"[벤치마크] 함대 {n_vessels}척 × {N_STEPS:,} 스텝: {elapsed:.2f}초")
+        print(f"  {N_STEPS / elapsed:,.0f} steps/sec "
+              f"({N_STEPS * n_vessels / elapsed:,.0f} vessel-steps/sec)")
+        sys.exit(0)
+
     print("=" * 70)
     print("Ammonia Vessel Simulation - 테스트")
     print("=" * 70)
@@ -517,6 +817,9 @@ if __name__ == "__main__":
             current_direction_deg=current_direction
         )
 
+        if not VERBOSE:
+            continue
+
         # 블랙아웃 정보
         blackout_info = simulator.get_blackout_info()
 
@@ -535,6 +838,11 @@ if __name__ == "__main__":
 
         time.sleep(0.5)  # 출력 딜레이
 
+    if not VERBOSE:
+        print(f"최종 위치: {state.latitude:.4f}°N, {state.longitude:.4f}°E")
+        print(f"속도: {state.speed:.1f} knots, 침로: {state.course:.1f}°")
+        print(f"(스텝별 출력: SIM_VERBOSE=1)\n")
+
     print("=" * 70)
     print("시뮬레이션 완료")
     print("=" * 70)
@@ -9,32 +9,65 @@ Oceanic Ship Prediction Module
 AIS 실시간 데이터가 없을 때 Great Circle 항법으로 예상 위치 계산
 """
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, asdict, replace
+from datetime import datetime, timedelta, timezone
 from typing import List, Tuple, Optional
 import math
+import time
+import numpy as np
 
+# Great Circle 커널: AOT 컴파일 모듈이 있으면 사용 (없으면 Numba JIT / 순수 Python)
+try:
+    import gc_kernels as _gc
+except ImportError:
+    import _gc_kernels as _gc
 
-@dataclass
-class Waypoint:
-    """항로 웨이포인트"""
-    latitude: float
-    longitude: float
-    name: str
+from routes import Waypoint, RouteGeometry
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OceanicVesselConfig:
-    """대양 선박 설정"""
+    """대양 선박 설정 (불변 - 진행 상태는 시뮬레이터가 보관)"""
     vessel_name: str
     mmsi: str
     imo: str
     vessel_type: str
     route_name: str
-    waypoints: List[Waypoint]
+    waypoints: Tuple[Waypoint, ...]
     speed_knots: float  # 평균 속도
-    current_waypoint_index: int = 0
-    start_time: datetime = None
+    start_time: Optional[datetime] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'waypoints', tuple(self.waypoints))
+
+
+@dataclass(slots=True)
+class PredictedPositionRow:
+    """대양 선박 예상 위치 (get_oceanic_ships_predicted_positions 반환 행)
+
+    기존 dict 반환과의 호환을 위해 row['latitude'] 형태의 조회를 지원합니다.
+    """
+    vessel_name: str
+    mmsi: str
+    imo: str
+    vessel_type: str
+    latitude: float
+    longitude: float
+    speed: float
+    course: float
+    current_leg: str
+    is_predicted: bool = True
+    data_source: str = 'PREDICTED'
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def as_dict(self) -> dict:
+        """JSON 직렬화를 위한 딕셔너리 변환"""
+        return asdict(self)
 
 
 class GreatCircleNavigator:
@@ -44,102 +77,104 @@ class GreatCircleNavigator:
     NAUTICAL_MILES_PER_KM = 0.539957
 
     @staticmethod
-    def calculate_distance_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """두 좌표 사이의 Great Circle 거리 계산 (해리)"""
-
-        # 라디안 변환
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
+    def calculate_angular_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """두 좌표 사이의 Great Circle 각거리 계산 (라디안)
 
-        # Haversine 공식
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-        distance_km = GreatCircleNavigator.EARTH_RADIUS_KM * c
-        distance_nm = distance_km * GreatCircleNavigator.NAUTICAL_MILES_PER_KM
+        acos 형태는 짧은 구간에서 인자가 1에 가까워 정밀도가 떨어지고
+        부동소수점 오차로 [-1, 1]을 벗어나면 ValueError가 발생하므로
+        항상 안정적인 Haversine(atan2) 형태를 사용합니다.
+        """
+        return _gc.angular_distance(lat1, lon1, lat2, lon2)
 
-        return distance_nm
+    @staticmethod
+    def calculate_distance_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """두 좌표 사이의 Great Circle 거리 계산 (해리)"""
+        return _gc.distance_nm(lat1, lon1, lat2, lon2)
 
     @staticmethod
     def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """두 좌표 사이의 초기 방위각 계산 (도)"""
-
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
-
-        dlon = lon2_rad - lon1_rad
-
-        y = math.sin(dlon) * math.cos(lat2_rad)
-        x = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon)
-
-        bearing_rad = math.atan2(y, x)
-        bearing_deg = math.degrees(bearing_rad)
-
-        # 0-360 범위로 정규화
-        bearing_deg = (bearing_deg + 360) % 360
-
-        return bearing_deg
+        return _gc.bearing_deg(lat1, lon1, lat2, lon2)
 
     @staticmethod
     def calculate_intermediate_point(
         lat1: float, lon1: float,
         lat2: float, lon2: float,
-        fraction: float
+        fraction: float,
+        distance_rad: Optional[float] = None
     ) -> Tuple[float, float]:
         """두 좌표 사이의 중간 지점 계산
 
         Args:
             fraction: 0.0 (시작점) ~ 1.0 (종료점)
+            distance_rad: 미리 계산된 구간 각거리 (None이면 Haversine으로 계산)
 
         Returns:
             (latitude, longitude)
         """
 
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
+        # Great Circle 각거리 (Haversine 형태 - 짧은 구간에서도 안정적)
+        if distance_rad is None:
+            distance_rad = _gc.angular_distance(lat1, lon1, lat2, lon2)
 
-        # Great Circle 각거리
-        distance_rad = math.acos(
-            math.sin(lat1_rad) * math.sin(lat2_rad) +
-            math.cos(lat1_rad) * math.cos(lat2_rad) * math.cos(lon2_rad - lon1_rad)
-        )
+        return _gc.intermediate_point(lat1, lon1, lat2, lon2, fraction, distance_rad)
+
+    @staticmethod
+    def calculate_intermediate_points(
+        lat1: np.ndarray, lon1: np.ndarray,
+        lat2: np.ndarray, lon2: np.ndarray,
+        fraction: np.ndarray,
+        distance_rad: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """calculate_intermediate_point의 NumPy 벡터화 버전 (배열 입력)
+
+        Returns:
+            (latitudes, longitudes)
+        """
+
+        lat1_rad = np.radians(lat1)
+        lon1_rad = np.radians(lon1)
+        lat2_rad = np.radians(lat2)
+        lon2_rad = np.radians(lon2)
+
+        # 각거리 ≈ 0 구간은 선형 보간 계수 사용 (0으로 나누기 방지)
+        degenerate = distance_rad < 1e-12
+        sin_delta = np.where(degenerate, 1.0, np.sin(distance_rad))
 
-        a = math.sin((1 - fraction) * distance_rad) / math.sin(distance_rad)
-        b = math.sin(fraction * distance_rad) / math.sin(distance_rad)
+        a = np.where(degenerate, 1 - fraction, np.sin((1 - fraction) * distance_rad) / sin_delta)
+        b = np.where(degenerate, fraction, np.sin(fraction * distance_rad) / sin_delta)
 
-        x = a * math.cos(lat1_rad) * math.cos(lon1_rad) + b * math.cos(lat2_rad) * math.cos(lon2_rad)
-        y = a * math.cos(lat1_rad) * math.sin(lon1_rad) + b * math.cos(lat2_rad) * math.sin(lon2_rad)
-        z = a * math.sin(lat1_rad) + b * math.sin(lat2_rad)
+        x = a * np.cos(lat1_rad) * np.cos(lon1_rad) + b * np.cos(lat2_rad) * np.cos(lon2_rad)
+        y = a * np.cos(lat1_rad) * np.sin(lon1_rad) + b * np.cos(lat2_rad) * np.sin(lon2_rad)
+        z = a * np.sin(lat1_rad) + b * np.sin(lat2_rad)
 
-        lat_rad = math.atan2(z, math.sqrt(x**2 + y**2))
-        lon_rad = math.atan2(y, x)
+        lat_rad = np.arctan2(z, np.sqrt(x**2 + y**2))
+        lon_rad = np.arctan2(y, x)
 
-        return math.degrees(lat_rad), math.degrees(lon_rad)
+        return np.degrees(lat_rad), np.degrees(lon_rad)
 
 
 class OceanicVesselSimulator:
     """대양 선박 시뮬레이터"""
 
     def __init__(self, config: OceanicVesselConfig):
+        # 설정은 불변 - 시작 시각이 없으면 채운 사본을 보관 (호출자 객체는 그대로)
+        if config.start_time is None:
+            config = replace(config, start_time=datetime.utcnow())
         self.config = config
         self.navigator = GreatCircleNavigator()
 
-        if self.config.start_time is None:
-            self.config.start_time = datetime.utcnow()
-
         self.current_time = self.config.start_time
         self.current_position: Optional[Tuple[float, float]] = None
         self.current_bearing: float = 0.0
 
+        # 구간별 각거리 / 거리 / 방위각 사전 계산 - 호출마다 재계산하지 않음
+        self.geometry = RouteGeometry(self.config.waypoints)
+        self._leg_names = tuple(
+            f"{wp1.name} → {wp2.name}"
+            for wp1, wp2 in zip(self.config.waypoints[:-1], self.config.waypoints[1:])
+        )
+
         # 초기 위치 계산
         self._initialize_position()
 
@@ -164,46 +199,78 @@ class OceanicVesselSimulator:
             (latitude, longitude, bearing, current_leg_name)
         """
 
+        geom = self.geometry
+
         # 이동 거리 계산 (해리)
         distance_traveled_nm = self.config.speed_knots * elapsed_hours
 
-        # 현재 어느 구간에 있는지 찾기
-        cumulative_distance = 0.0
+        # 현재 구간 찾기 - 누적 거리 이진 탐색 (cum_nm[i] >= 이동 거리인 첫 구간)
+        i = int(np.searchsorted(geom.cum_nm, distance_traveled_nm, side='left'))
 
-        for i in range(len(self.config.waypoints) - 1):
+        if i < geom.n_legs:
             wp1 = self.config.waypoints[i]
             wp2 = self.config.waypoints[i + 1]
 
-            leg_distance = self.navigator.calculate_distance_nm(
+            leg_distance = float(geom.leg_nm[i])
+            cumulative_distance = float(geom.cum_nm[i - 1]) if i > 0 else 0.0
+
+            distance_in_leg = distance_traveled_nm - cumulative_distance
+            fraction = distance_in_leg / leg_distance if leg_distance > 0 else 0
+
+            lat, lon = self.navigator.calculate_intermediate_point(
                 wp1.latitude, wp1.longitude,
-                wp2.latitude, wp2.longitude
+                wp2.latitude, wp2.longitude,
+                fraction,
+                distance_rad=float(geom.leg_delta_rad[i])
             )
 
-            if cumulative_distance + leg_distance >= distance_traveled_nm:
-                # 이 구간에 있음
-                distance_in_leg = distance_traveled_nm - cumulative_distance
-                fraction = distance_in_leg / leg_distance if leg_distance > 0 else 0
+            return lat, lon, float(geom.bearings[i]), self._leg_names[i]
 
-                lat, lon = self.navigator.calculate_intermediate_point(
-                    wp1.latitude, wp1.longitude,
-                    wp2.latitude, wp2.longitude,
-                    fraction
-                )
+        # 마지막 웨이포인트 도달
+        last_wp = self.config.waypoints[-1]
+        return last_wp.latitude, last_wp.longitude, 0.0, f"Arrived at {last_wp.name}"
+
+    def get_predicted_positions(self, times_sec: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """여러 경과 시각의 예상 위치를 한 번에 계산 (벡터화)
+
+        Args:
+            times_sec: 시작 시간으로부터 경과한 시간 배열 (초)
+
+        Returns:
+            (latitudes, longitudes, bearings) - 도착 이후 시각은 마지막 웨이포인트, 방위각 0
+        """
 
-                bearing = self.navigator.calculate_bearing(
-                    wp1.latitude, wp1.longitude,
-                    wp2.latitude, wp2.longitude
-                )
+        geom = self.geometry
+        times_sec = np.asarray(times_sec, dtype=np.float64)
+        n_legs = geom.n_legs
 
-                leg_name = f"{wp1.name} → {wp2.name}"
+        if n_legs == 0:
+            zeros = np.zeros_like(times_sec)
+            return zeros + geom.lats[0], zeros + geom.lons[0], zeros
 
-                return lat, lon, bearing, leg_name
+        # 이동 거리 → 구간 인덱스 (누적 거리 이진 탐색)
+        dists = self.config.speed_knots * times_sec / 3600.0
+        idx = np.searchsorted(geom.cum_nm, dists, side='left').clip(0, n_legs - 1)
 
-            cumulative_distance += leg_distance
+        leg_start = np.where(idx > 0, geom.cum_nm[idx - 1], 0.0)
+        leg_nm = geom.cum_nm[idx] - leg_start
+        frac = np.where(leg_nm > 0, (dists - leg_start) / np.where(leg_nm > 0, leg_nm, 1.0), 0.0)
+
+        lats, lons = self.navigator.calculate_intermediate_points(
+            geom.lats[idx], geom.lons[idx],
+            geom.lats[idx + 1], geom.lons[idx + 1],
+            frac,
+            geom.leg_delta_rad[idx]
+        )
+        bearings = geom.bearings[idx]
 
         # 마지막 웨이포인트 도달
-        last_wp = self.config.waypoints[-1]
-        return last_wp.latitude, last_wp.longitude, 0.0, f"Arrived at {last_wp.name}"
+        arrived = dists > geom.cum_nm[-1]
+        lats = np.where(arrived, geom.lats[-1], lats)
+        lons = np.where(arrived, geom.lons[-1], lons)
+        bearings = np.where(arrived, 0.0, bearings)
+
+        return lats, lons, bearings
 
 
 # ============================================================================
@@ -274,57 +341,49 @@ def create_hmm_algeciras_route() -> OceanicVesselConfig:
     )
 
 
-def get_oceanic_ships_predicted_positions() -> List[dict]:
+# ============================================================================
+# 대양 선박 예상 위치 (프로세스당 1회 항로 구성)
+# ============================================================================
+
+# 항로 / 시뮬레이터는 import 시 1회 생성 - 요청마다 재구성하지 않음
+_OCEANIC_SIMULATORS: Tuple[OceanicVesselSimulator, ...] = (
+    OceanicVesselSimulator(create_prism_courage_route()),
+    OceanicVesselSimulator(create_hmm_algeciras_route()),
+)
+
+# 출발 시각 (UTC epoch 초) - 경과 시간은 time.time()과의 차이로 계산
+_OCEANIC_START_TS: Tuple[float, ...] = tuple(
+    sim.config.start_time.replace(tzinfo=timezone.utc).timestamp()
+    for sim in _OCEANIC_SIMULATORS
+)
+
+
+def get_oceanic_ships_predicted_positions() -> List[PredictedPositionRow]:
     """대양 선박들의 현재 예상 위치 반환
 
     Returns:
-        List of dicts with keys: vessel_name, mmsi, latitude, longitude, bearing, leg_name, is_predicted
+        List of PredictedPositionRow (vessel_name, mmsi, latitude, longitude, course, current_leg, ...)
+        - row['key'] 조회 지원, dict가 필요하면 row.as_dict()
     """
 
-    prism = create_prism_courage_route()
-    hmm = create_hmm_algeciras_route()
-
-    sim_prism = OceanicVesselSimulator(prism)
-    sim_hmm = OceanicVesselSimulator(hmm)
-
-    # 현재 시간 기준 경과 시간 계산
-    now = datetime.utcnow()
-
-    prism_elapsed_hours = (now - prism.start_time).total_seconds() / 3600
-    hmm_elapsed_hours = (now - hmm.start_time).total_seconds() / 3600
-
-    # 예상 위치 계산
-    prism_lat, prism_lon, prism_bearing, prism_leg = sim_prism.get_predicted_position(prism_elapsed_hours)
-    hmm_lat, hmm_lon, hmm_bearing, hmm_leg = sim_hmm.get_predicted_position(hmm_elapsed_hours)
-
-    return [
-        {
-            'vessel_name': prism.vessel_name,
-            'mmsi': prism.mmsi,
-            'imo': prism.imo,
-            'vessel_type': prism.vessel_type,
-            'latitude': prism_lat,
-            'longitude': prism_lon,
-            'speed': prism.speed_knots,
-            'course': prism_bearing,
-            'current_leg': prism_leg,
-            'is_predicted': True,
-            'data_source': 'PREDICTED'
-        },
-        {
-            'vessel_name': hmm.vessel_name,
-            'mmsi': hmm.mmsi,
-            'imo': hmm.imo,
-            'vessel_type': hmm.vessel_type,
-            'latitude': hmm_lat,
-            'longitude': hmm_lon,
-            'speed': hmm.speed_knots,
-            'course': hmm_bearing,
-            'current_leg': hmm_leg,
-            'is_predicted': True,
-            'data_source': 'PREDICTED'
-        }
-    ]
+    # 현재 시간 기준 경과 시간 계산 (datetime 객체 생성 없이 epoch 초 차이 사용)
+    now = time.time()
+
+    positions = []
+
+    for sim, start_ts in zip(_OCEANIC_SIMULATORS, _OCEANIC_START_TS):
+        config = sim.config
+        elapsed_hours = (now - start_ts) / 3600.0
+
+        # 예상 위치 계산
+        lat, lon, bearing, leg = sim.get_predicted_position(elapsed_hours)
+
+        positions.append(PredictedPositionRow(
+            config.vessel_name, config.mmsi, config.imo, config.vessel_type,
+            lat, lon, config.speed_knots, bearing, leg
+        ))
+
+    return positions
 
 
 if __name__ == "__main__":
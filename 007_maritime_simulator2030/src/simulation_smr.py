@@ -16,19 +16,199 @@ import numpy as np
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from enum import IntEnum
+import shapely
 from shapely.geometry import Point, Polygon, LineString
 from shapely.ops import nearest_points
 import json
+import math
 
 from ais_client import VesselState
-from prediction_engine import DeadReckoningEngine
+from prediction_engine import DR_ENGINE as _DR, haversine_m, dead_reckon, drift_velocity
+from numba_compat import njit, prange
+from _gc_kernels import bearing_deg
 
 
 # 실험용 MMSI (SMR 선박)
 SMR_MMSI = "999999999"
 
+# 중심선 복귀 비례 게인 (P 컨트롤러) / 최대 선회율 - SMR 선박은 대형선박이므로 선회율 낮음
+SMR_CTE_GAIN = 0.05
+SMR_MAX_TURN_RATE_DEG_PER_SEC = 1.5
 
-@dataclass
+# 지오펜스 구역이 이 개수 이상이면 STRtree 공간 인덱스로 후보 구역 조회 (미만이면 경계 상자 순차 검사)
+ZONE_INDEX_MIN_ZONES = 8
+
+# 위반 이벤트 로그 링 버퍼 크기 (초과 시 가장 오래된 이벤트부터 덮어씀)
+VIOLATION_LOG_CAPACITY = 10000
+
+
+class EventType(IntEnum):
+    """위반 이벤트 유형 (로그 배열에는 uint8 코드로 저장)"""
+    GEOFENCE_EXIT = 0
+    GEOFENCE_VIOLATION = 1
+    CORRIDOR_DEVIATION = 2
+    SPEED_VIOLATION = 3
+
+
+class Severity(IntEnum):
+    """위반 심각도"""
+    INFO = 0
+    WARNING = 1
+    CRITICAL = 2
+
+
+# 시뮬레이션 시각 기준점 (ViolationEvent.ts_us = 기준점 이후 마이크로초)
+_EPOCH = datetime(1970, 1, 1)
+
+
+@njit(cache=True)
+def _pip_raycast(px: float, py: float, xs: np.ndarray, ys: np.ndarray) -> bool:
+    """Ray casting (crossing number) 기반 점-다각형 포함 판정
+
+    점 (px, py)에서 +x 방향 반직선이 다각형 변과 교차하는 횟수가 홀수면 내부입니다.
+    xs, ys: 다각형 꼭짓점 좌표 배열 (닫힘 여부 무관)
+    경계 위의 점은 외부로 판정합니다 (Shapely contains와 동일).
+    """
+    inside = False
+    n = xs.shape[0]
+    j = n - 1
+
+    for i in range(n):
+        # 변 (j → i) 위의 점 → 경계 (외부)
+        cross = (xs[i] - xs[j]) * (py - ys[j]) - (ys[i] - ys[j]) * (px - xs[j])
+        if (cross == 0.0
+                and min(xs[i], xs[j]) <= px <= max(xs[i], xs[j])
+                and min(ys[i], ys[j]) <= py <= max(ys[i], ys[j])):
+            return False
+
+        if (ys[i] > py) != (ys[j] > py):
+            x_cross = xs[i] + (py - ys[i]) * (xs[j] - xs[i]) / (ys[j] - ys[i])
+            if px < x_cross:
+                inside = not inside
+        j = i
+
+    return inside
+
+
+@njit(cache=True)
+def nearest_on_polyline(
+    plat: float, plon: float,
+    lat0: np.ndarray, lon0: np.ndarray,
+    lat1: np.ndarray, lon1: np.ndarray
+) -> Tuple[float, float]:
+    """폴리라인 위에서 점 (plat, plon)에 가장 가까운 점 (위도, 경도)
+
+    plat 기준 등장방형(equirectangular) 국소 평면에서 각 선분에 매개변수 투영 후
+    최소 거리 지점을 선택합니다.
+    lat0/lon0, lat1/lon1: 선분 시작점 / 끝점 배열
+    """
+    kx = math.cos(math.radians(plat))
+
+    best_d2 = np.inf
+    best_lat = plat
+    best_lon = plon
+
+    for k in range(lat0.shape[0]):
+        # 국소 평면 좌표 (점 기준 원점)
+        ax = (lon0[k] - plon) * kx
+        ay = lat0[k] - plat
+        dx = (lon1[k] - lon0[k]) * kx
+        dy = lat1[k] - lat0[k]
+
+        seg_len2 = dx * dx + dy * dy
+        if seg_len2 > 0.0:
+            t = -(ax * dx + ay * dy) / seg_len2
+            if t < 0.0:
+                t = 0.0
+            elif t > 1.0:
+                t = 1.0
+        else:
+            t = 0.0
+
+        qx = ax + t * dx
+        qy = ay + t * dy
+        d2 = qx * qx + qy * qy
+
+        if d2 < best_d2:
+            best_d2 = d2
+            best_lat = lat0[k] + t * (lat1[k] - lat0[k])
+            best_lon = lon0[k] + t * (lon1[k] - lon0[k])
+
+    return best_lat, best_lon
+
+
+@njit(cache=True)
+def _distance_to_polyline_m(
+    plat: float, plon: float,
+    lat0: np.ndarray, lon0: np.ndarray,
+    lat1: np.ndarray, lon1: np.ndarray
+) -> float:
+    """점에서 폴리라인까지의 거리 (미터)"""
+    n_lat, n_lon = nearest_on_polyline(plat, plon, lat0, lon0, lat1, lon1)
+    return haversine_m(plat, plon, n_lat, n_lon)
+
+
+@njit(cache=True)
+def _smr_step_core(
+    lat: float, lon: float, course: float, speed: float,
+    target_lat: float, target_lon: float, cte: float, dt: float,
+    k_p: float, max_turn_rate: float,
+    drift_east_ms: float, drift_north_ms: float
+) -> Tuple[float, float, float, float, float, float]:
+    """SMR 선박 1스텝 수치 계산 (목표 방위 → 침로 제어 → Dead Reckoning)
+
+    Shapely 판정 / 위반 로깅은 호출 측(SMRVesselSimulator.step)에서 처리합니다.
+
+    Args:
+        cte: 중심선까지의 거리 (미터)
+        k_p: 중심선 복귀 비례 게인
+        max_turn_rate: 최대 선회율 (도/초)
+
+    Returns:
+        (new_lat, new_lon, new_course, distance_moved_m, target_course, distance_to_target_m)
+    """
+
+    # 목표 방향 및 거리
+    target_course = bearing_deg(lat, lon, target_lat, target_lon)
+    distance_to_target = haversine_m(lat, lon, target_lat, target_lon)
+
+    # 중심선 추종 (P 컨트롤러) - cte = 0이면 보정량도 0이므로 부호는 +로 취급
+    course_correction = min(k_p * cte, 10.0)
+    if cte >= 0.0:
+        desired_course = target_course + course_correction
+    else:
+        desired_course = target_course - course_correction
+
+    # 침로 조정 (선회율 제한) - 직진 구간의 정상 상태(|차이| ≤ 제한)를 먼저 판정
+    # desired_course ∈ [−10, 370), course ∈ [0, 360) → 한 번의 조건부 가감으로 [−180, 180)
+    course_diff = desired_course - course
+    if course_diff >= 180.0:
+        course_diff -= 360.0
+    elif course_diff < -180.0:
+        course_diff += 360.0
+    max_course_change = max_turn_rate * dt
+
+    if -max_course_change <= course_diff <= max_course_change:
+        course = desired_course
+    elif course_diff > 0.0:
+        course += max_course_change
+    else:
+        course -= max_course_change
+
+    if course >= 360.0:
+        course -= 360.0
+    elif course < 0.0:
+        course += 360.0
+
+    # Dead Reckoning
+    new_lat, new_lon = dead_reckon(lat, lon, course, speed, dt, drift_east_ms, drift_north_ms)
+    distance_moved = haversine_m(lat, lon, new_lat, new_lon)
+
+    return new_lat, new_lon, course, distance_moved, target_course, distance_to_target
+
+
+@dataclass(frozen=True, slots=True)
 class GeofenceZone:
     """지오펜스 구역 정의"""
 
@@ -37,44 +217,145 @@ class GeofenceZone:
     zone_type: str  # 'ALLOWED', 'RESTRICTED', 'PROHIBITED'
 
     # 폴리곤 경계 (위도, 경도 좌표 리스트)
-    boundary_coords: List[Tuple[float, float]]
+    boundary_coords: Tuple[Tuple[float, float], ...]
 
     # 규정
     max_speed_knots: Optional[float] = None  # 최대 허용 속도
     mandatory_reporting: bool = False  # 필수 보고 구역
 
+    # 캐시된 Shapely 지오메트리 (__post_init__에서 1회 생성)
+    _polygon: Polygon = field(init=False, repr=False, compare=False)
+    _boundary: LineString = field(init=False, repr=False, compare=False)
+    _bbox: Tuple[float, float, float, float] = field(init=False, repr=False, compare=False)
+    _poly_lats: np.ndarray = field(init=False, repr=False, compare=False)
+    _poly_lons: np.ndarray = field(init=False, repr=False, compare=False)
+    _is_aabb: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # frozen 데이터클래스 - 파생 캐시는 object.__setattr__로 1회 기록
+        _set = object.__setattr__
+        _set(self, 'boundary_coords', tuple(tuple(coord) for coord in self.boundary_coords))
+
+        # Shapely는 (lon, lat) 순서
+        _set(self, '_polygon', Polygon([(lon, lat) for lat, lon in self.boundary_coords]))
+        _set(self, '_boundary', self._polygon.boundary)
+
+        # 준비된(prepared) 지오메트리 - 변 인덱스를 만들어 반복 contains 판정 가속 (Shapely 2.x)
+        try:
+            shapely.prepare(self._polygon)
+        except AttributeError:
+            pass
+
+        # 경계 상자 (min_lon, min_lat, max_lon, max_lat)
+        lats = [lat for lat, _ in self.boundary_coords]
+        lons = [lon for _, lon in self.boundary_coords]
+        _set(self, '_bbox', (min(lons), min(lats), max(lons), max(lats)))
+
+        # Ray casting용 꼭짓점 배열
+        _set(self, '_poly_lats', np.asarray(lats, dtype=np.float64))
+        _set(self, '_poly_lons', np.asarray(lons, dtype=np.float64))
+
+        # 축 정렬 직사각형 구역이면 경계 상자 비교만으로 판정 (Shapely 생략)
+        _set(self, '_is_aabb', self._detect_aabb())
+
+    def _detect_aabb(self) -> bool:
+        """경계가 축 정렬 직사각형(위도 2개 / 경도 2개)인지 확인"""
+        coords = list(self.boundary_coords)
+        if len(coords) > 1 and coords[0] == coords[-1]:
+            coords = coords[:-1]
+
+        if len(coords) != 4 or len(set(coords)) != 4:
+            return False
+        if len({lat for lat, _ in coords}) != 2 or len({lon for _, lon in coords}) != 2:
+            return False
+
+        # 모든 변이 위도선 또는 경도선과 평행
+        for (lat1, lon1), (lat2, lon2) in zip(coords, coords[1:] + coords[:1]):
+            if (lat1 == lat2) == (lon1 == lon2):
+                return False
+
+        return True
+
     def to_polygon(self) -> Polygon:
         """Shapely Polygon 객체로 변환"""
-        return Polygon(self.boundary_coords)
+        return self._polygon
+
+    def bbox_contains(self, latitude: float, longitude: float) -> bool:
+        """점이 경계 상자 내에 있는지 확인 (contains_point 사전 필터)"""
+        b = self._bbox
+        return b[0] <= longitude <= b[2] and b[1] <= latitude <= b[3]
 
     def contains_point(self, latitude: float, longitude: float) -> bool:
-        """점이 구역 내에 있는지 확인"""
-        point = Point(longitude, latitude)  # Shapely는 (lon, lat) 순서
-        polygon = self.to_polygon()
-        return polygon.contains(point)
+        """점이 구역 내에 있는지 확인 (경계 위는 외부)"""
+        if self._is_aabb:
+            b = self._bbox
+            return b[0] < longitude < b[2] and b[1] < latitude < b[3]
+
+        return _pip_raycast(longitude, latitude, self._poly_lons, self._poly_lats)
+
+    def contains_points(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """여러 점의 구역 포함 여부를 한 번에 확인 (벡터화)"""
+        if self._is_aabb:
+            b = self._bbox
+            latitudes = np.asarray(latitudes)
+            longitudes = np.asarray(longitudes)
+            return (
+                (b[0] < longitudes) & (longitudes < b[2]) &
+                (b[1] < latitudes) & (latitudes < b[3])
+            )
+
+        # 경계 상자 안의 점만 준비된 폴리곤으로 판정
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        b = self._bbox
+        result = (
+            (b[0] <= longitudes) & (longitudes <= b[2]) &
+            (b[1] <= latitudes) & (latitudes <= b[3])
+        )
+
+        if result.any():
+            result[result] = shapely.contains_xy(self._polygon, longitudes[result], latitudes[result])
+
+        return result
 
     def distance_to_boundary(self, latitude: float, longitude: float) -> float:
         """점에서 경계까지의 최단 거리 (미터)"""
+        if self._is_aabb:
+            return self._aabb_distance_to_boundary(latitude, longitude)
+
         point = Point(longitude, latitude)
-        polygon = self.to_polygon()
 
         # 경계까지의 거리 계산
-        boundary = polygon.boundary
-        nearest = nearest_points(point, boundary)[1]
+        nearest = nearest_points(point, self._boundary)[1]
 
         # Haversine 거리 계산
-        from prediction_engine import DeadReckoningEngine
-        dr = DeadReckoningEngine()
-
-        distance_m = dr.calculate_distance_haversine(
-            latitude, longitude,
-            nearest.y, nearest.x
-        )
+        return haversine_m(latitude, longitude, nearest.y, nearest.x)
+
+    def _aabb_distance_to_boundary(self, latitude: float, longitude: float) -> float:
+        """직사각형 구역 경계까지의 거리 (미터) - 최근접 경계점을 닫힌 형태로 계산"""
+        min_lon, min_lat, max_lon, max_lat = self._bbox
+
+        if min_lon <= longitude <= max_lon and min_lat <= latitude <= max_lat:
+            # 내부: 가장 가까운 변으로 수선
+            d = latitude - min_lat
+            nearest_lat, nearest_lon = min_lat, longitude
+            if max_lat - latitude < d:
+                d = max_lat - latitude
+                nearest_lat = max_lat
+            if longitude - min_lon < d:
+                d = longitude - min_lon
+                nearest_lat, nearest_lon = latitude, min_lon
+            if max_lon - longitude < d:
+                nearest_lat, nearest_lon = latitude, max_lon
+        else:
+            # 외부: 좌표를 경계 상자로 클램프
+            nearest_lat = min(max(latitude, min_lat), max_lat)
+            nearest_lon = min(max(longitude, min_lon), max_lon)
 
-        return distance_m
+        return haversine_m(latitude, longitude, nearest_lat, nearest_lon)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Corridor:
     """항해 통로 정의"""
 
@@ -82,7 +363,7 @@ class Corridor:
     corridor_name: str
 
     # 중심선 (위도, 경도 좌표 리스트)
-    centerline_coords: List[Tuple[float, float]]
+    centerline_coords: Tuple[Tuple[float, float], ...]
 
     # 통로 폭 (미터)
     width_m: float = 10000.0  # 기본 10km 폭
@@ -90,49 +371,143 @@ class Corridor:
     # 속도 제한
     max_speed_knots: float = 20.0
 
+    # 캐시된 Shapely 지오메트리 / 선분 배열 (__post_init__에서 1회 생성)
+    _linestring: LineString = field(init=False, repr=False, compare=False)
+    _seg_lat0: np.ndarray = field(init=False, repr=False, compare=False)
+    _seg_lon0: np.ndarray = field(init=False, repr=False, compare=False)
+    _seg_lat1: np.ndarray = field(init=False, repr=False, compare=False)
+    _seg_lon1: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        _set = object.__setattr__
+        _set(self, 'centerline_coords', tuple(tuple(coord) for coord in self.centerline_coords))
+
+        # (경도, 위도) 순서로 변환
+        _set(self, '_linestring', LineString([(lon, lat) for lat, lon in self.centerline_coords]))
+
+        # 중심선 선분 끝점 배열 (선분 k = 점 k → 점 k+1)
+        lats = np.array([lat for lat, _ in self.centerline_coords], dtype=np.float64)
+        lons = np.array([lon for _, lon in self.centerline_coords], dtype=np.float64)
+        _set(self, '_seg_lat0', lats[:-1].copy())
+        _set(self, '_seg_lon0', lons[:-1].copy())
+        _set(self, '_seg_lat1', lats[1:].copy())
+        _set(self, '_seg_lon1', lons[1:].copy())
+
     def to_linestring(self) -> LineString:
         """Shapely LineString 객체로 변환"""
-        # (경도, 위도) 순서로 변환
-        coords_lon_lat = [(lon, lat) for lat, lon in self.centerline_coords]
-        return LineString(coords_lon_lat)
+        return self._linestring
 
     def distance_from_centerline(self, latitude: float, longitude: float) -> float:
         """점에서 중심선까지의 거리 (미터)"""
-        point = Point(longitude, latitude)
-        centerline = self.to_linestring()
-
-        # 중심선에서 가장 가까운 점 찾기
-        nearest = nearest_points(point, centerline)[1]
-
-        # Haversine 거리 계산
-        from prediction_engine import DeadReckoningEngine
-        dr = DeadReckoningEngine()
-
-        distance_m = dr.calculate_distance_haversine(
+        return _distance_to_polyline_m(
             latitude, longitude,
-            nearest.y, nearest.x
+            self._seg_lat0, self._seg_lon0,
+            self._seg_lat1, self._seg_lon1
         )
 
-        return distance_m
-
     def is_within_corridor(self, latitude: float, longitude: float) -> bool:
         """점이 통로 내에 있는지 확인"""
         distance = self.distance_from_centerline(latitude, longitude)
         return distance <= (self.width_m / 2)
 
 
-@dataclass
+@dataclass(slots=True)
 class ViolationEvent:
-    """항로 이탈 이벤트"""
+    """
+    항로 이탈 이벤트
+
+    유형 / 심각도는 정수 코드, 상세 정보는 숫자 필드로 보관하고
+    문자열 / 딕셔너리는 속성 조회(to_dict 포함) 시에만 생성합니다.
+
+    숫자 필드 (a, b, c):
+    - CORRIDOR_DEVIATION: 이탈 거리 (m), 통로 폭 (m), 임계값 (m)
+    - SPEED_VIOLATION: 현재 속도 (knots), 허용 속도 (knots)
+    """
+
+    ts_us: int  # 시뮬레이션 시각 (1970-01-01 기준 마이크로초, 로그 버퍼 값 그대로)
+    code: int  # EventType
+    sev: int  # Severity
+
+    lat: float
+    lon: float
+
+    a: float = 0.0
+    b: float = 0.0
+    c: float = 0.0
+    zone: Optional[GeofenceZone] = None  # 지오펜스 이벤트의 대상 구역
+
+    # from_details로 만든 이벤트의 상세 정보 (None이면 숫자 필드에서 생성)
+    raw_details: Optional[Dict] = field(default=None, repr=False)
+
+    @classmethod
+    def from_details(
+        cls,
+        timestamp: datetime,
+        event_type: str,
+        severity: str,
+        latitude: float,
+        longitude: float,
+        details: Dict
+    ) -> 'ViolationEvent':
+        """기존 생성자 형식 (timestamp, event_type, severity, latitude, longitude, details)으로 생성"""
+        return cls(
+            (timestamp - _EPOCH) // timedelta(microseconds=1),
+            EventType[event_type],
+            Severity[severity],
+            latitude,
+            longitude,
+            raw_details=details
+        )
+
+    @property
+    def timestamp(self) -> datetime:
+        return _EPOCH + timedelta(microseconds=self.ts_us)
+
+    @property
+    def event_type(self) -> str:
+        return EventType(self.code).name
+
+    @property
+    def severity(self) -> str:
+        return Severity(self.sev).name
+
+    @property
+    def latitude(self) -> float:
+        return self.lat
+
+    @property
+    def longitude(self) -> float:
+        return self.lon
+
+    @property
+    def details(self) -> Dict:
+        """상세 정보 딕셔너리 (기존 형식)"""
+
+        if self.raw_details is not None:
+            return self.raw_details
 
-    timestamp: datetime
-    event_type: str  # 'GEOFENCE_EXIT', 'CORRIDOR_DEVIATION', 'SPEED_VIOLATION'
-    severity: str  # 'INFO', 'WARNING', 'CRITICAL'
+        if self.code == EventType.CORRIDOR_DEVIATION:
+            return {
+                'deviation_distance_m': self.a,
+                'corridor_width_m': self.b,
+                'threshold_m': self.c
+            }
 
-    latitude: float
-    longitude: float
+        zone = self.zone
 
-    details: Dict
+        if self.code == EventType.SPEED_VIOLATION:
+            return {
+                'zone_id': zone.zone_id,
+                'zone_name': zone.zone_name,
+                'current_speed_knots': self.a,
+                'max_allowed_speed_knots': self.b
+            }
+
+        return {
+            'zone_id': zone.zone_id,
+            'zone_name': zone.zone_name,
+            'zone_type': zone.zone_type
+        }
 
     def to_dict(self) -> Dict:
         return {
@@ -194,6 +569,11 @@ class SMRVesselSimulator:
         self.geofence_zones = geofence_zones or []
         self.update_interval = update_interval_sec
 
+        # 지오펜스 공간 인덱스 (구역 목록은 생성 후 변경하지 않는 것을 전제)
+        self._zone_index: Optional[shapely.STRtree] = None
+        if len(self.geofence_zones) >= ZONE_INDEX_MIN_ZONES:
+            self._zone_index = shapely.STRtree([zone.to_polygon() for zone in self.geofence_zones])
+
         # 현재 상태
         self.vessel_state: Optional[VesselState] = None
         self.current_centerline_index = 0  # 현재 추종 중인 중심선 세그먼트
@@ -201,11 +581,30 @@ class SMRVesselSimulator:
         # 시뮬레이션 시간
         self.simulation_time = datetime.utcnow()
 
-        # 이벤트 로그
-        self.violation_log: List[ViolationEvent] = []
-
-        # Dead Reckoning 엔진
-        self.dr_engine = DeadReckoningEngine()
+        # 이벤트 로그 - 열 단위(SoA) 링 버퍼
+        cap = VIOLATION_LOG_CAPACITY
+        self._log_cap = cap
+        self._log_idx = 0  # 다음 기록 위치
+        self._log_count = 0  # 보관 중인 이벤트 수 (최대 cap)
+        self._log_time = np.empty(cap, dtype='datetime64[us]')
+        self._log_lat = np.empty(cap, dtype=np.float64)
+        self._log_lon = np.empty(cap, dtype=np.float64)
+        self._log_event = np.empty(cap, dtype=np.uint8)
+        self._log_severity = np.empty(cap, dtype=np.uint8)
+        self._log_a = np.empty(cap, dtype=np.float64)
+        self._log_b = np.empty(cap, dtype=np.float64)
+        self._log_c = np.empty(cap, dtype=np.float64)
+        self._log_zone = np.empty(cap, dtype=np.int32)
+
+        # Dead Reckoning 엔진 (모듈 공용 인스턴스)
+        self.dr_engine = _DR
+
+        # 중심선 거리 캐시 (위도, 경도, 거리)
+        self._cte_cache: Tuple[float, float, float] = (math.nan, math.nan, 0.0)
+
+        # 드리프트 속도 캐시 - (풍속, 풍향, 해류 속도, 해류 방향) → (동, 북 m/s)
+        self._drift_key: Optional[Tuple] = None
+        self._drift_ms: Tuple[float, float] = (0.0, 0.0)
 
         # 통계
         self.stats = {
@@ -292,138 +691,92 @@ class SMRVesselSimulator:
         target_point = self.corridor.centerline_coords[self.current_centerline_index]
 
         # ===================================================================
-        # 2. 목표 방향 및 거리 계산
+        # 2. 통로 중심선 추종 / 침로 및 속도 조정 / Dead Reckoning
         # ===================================================================
 
-        target_course = self.dr_engine.calculate_bearing(
-            self.vessel_state.latitude,
-            self.vessel_state.longitude,
-            target_point[0],
-            target_point[1]
-        )
+        state = self.vessel_state
+        lat = state.latitude
+        lon = state.longitude
 
-        distance_to_target = self.dr_engine.calculate_distance_haversine(
-            self.vessel_state.latitude,
-            self.vessel_state.longitude,
-            target_point[0],
-            target_point[1]
-        )
-
-        # ===================================================================
-        # 3. 통로 중심선 추종 (Path Following)
-        # ===================================================================
-
-        # 중심선으로부터의 거리 계산
-        cross_track_error = self.corridor.distance_from_centerline(
-            self.vessel_state.latitude,
-            self.vessel_state.longitude
-        )
-
-        # 중심선으로 복귀하기 위한 침로 수정
-        # 간단한 비례 제어 (P 컨트롤러)
-        K_p = 0.05  # 비례 게인
-        course_correction = K_p * cross_track_error
-
-        # 목표 침로에 수정값 추가
-        desired_course = target_course + np.sign(cross_track_error) * min(course_correction, 10.0)
-
-        # ===================================================================
-        # 4. 침로 및 속도 조정
-        # ===================================================================
-
-        max_turn_rate_deg_per_sec = 1.5  # SMR 선박은 대형선박이므로 선회율 낮음
-
-        course_diff = (desired_course - self.vessel_state.course + 180) % 360 - 180
-        max_course_change = max_turn_rate_deg_per_sec * dt
-
-        if abs(course_diff) > max_course_change:
-            self.vessel_state.course += np.sign(course_diff) * max_course_change
-        else:
-            self.vessel_state.course = desired_course
-
-        self.vessel_state.course = self.vessel_state.course % 360
-        self.vessel_state.heading = self.vessel_state.course
+        # 중심선으로부터의 거리 (직전 스텝의 통로 이탈 감지에서 같은 위치로 계산한 값 재사용)
+        cross_track_error = self._cross_track_error(lat, lon)
 
         # 속도: 통로 내 최대 속도 준수
         target_speed = min(self.config.cruise_speed_knots, self.corridor.max_speed_knots)
-        self.vessel_state.speed = target_speed
 
-        # ===================================================================
-        # 5. Dead Reckoning으로 새 위치 계산
-        # ===================================================================
+        # 드리프트 속도는 환경 조건이 바뀔 때만 재계산
+        drift_key = (wind_speed_knots, wind_direction_deg, current_speed_knots, current_direction_deg)
+        if drift_key != self._drift_key:
+            self._drift_key = drift_key
+            self._drift_ms = drift_velocity(
+                *drift_key, self.dr_engine.wind_drift_coef, self.dr_engine.current_drift_coef
+            )
 
-        prediction = self.dr_engine.predict_position(
-            last_latitude=self.vessel_state.latitude,
-            last_longitude=self.vessel_state.longitude,
-            course_deg=self.vessel_state.course,
-            speed_knots=self.vessel_state.speed,
-            time_elapsed_seconds=dt,
-            wind_speed_knots=wind_speed_knots,
-            wind_direction_deg=wind_direction_deg,
-            current_speed_knots=current_speed_knots,
-            current_direction_deg=current_direction_deg
+        # 수치 계산은 JIT 커널에서 일괄 처리
+        (
+            new_lat, new_lon, new_course,
+            distance_moved, _target_course, distance_to_target
+        ) = _smr_step_core(
+            lat, lon, state.course, target_speed,
+            target_point[0], target_point[1],
+            cross_track_error, float(dt),
+            SMR_CTE_GAIN, SMR_MAX_TURN_RATE_DEG_PER_SEC,
+            self._drift_ms[0], self._drift_ms[1]
         )
 
-        # 이동 거리 기록
-        distance_moved = self.dr_engine.calculate_distance_haversine(
-            self.vessel_state.latitude,
-            self.vessel_state.longitude,
-            prediction.predicted_latitude,
-            prediction.predicted_longitude
-        )
         self.stats['total_distance_traveled_m'] += distance_moved
 
-        # 위치 업데이트
-        self.vessel_state.latitude = prediction.predicted_latitude
-        self.vessel_state.longitude = prediction.predicted_longitude
-        self.vessel_state.timestamp = self.simulation_time
+        # 상태 갱신
+        state.course = new_course
+        state.heading = new_course
+        state.speed = target_speed
+        state.latitude = new_lat
+        state.longitude = new_lon
+        state.timestamp = self.simulation_time
 
         # ===================================================================
-        # 6. 통로 이탈 감지
+        # 3. 통로 이탈 감지
         # ===================================================================
 
-        if not self.corridor.is_within_corridor(
+        deviation_distance = self._cross_track_error(
             self.vessel_state.latitude,
             self.vessel_state.longitude
-        ):
-            deviation_distance = self.corridor.distance_from_centerline(
-                self.vessel_state.latitude,
-                self.vessel_state.longitude
-            )
+        )
 
+        if deviation_distance > self.corridor.width_m / 2:
             if deviation_distance > self.config.corridor_deviation_threshold_m:
                 # 중대한 통로 이탈
                 self._log_violation(
-                    event_type='CORRIDOR_DEVIATION',
-                    severity='CRITICAL',
-                    details={
-                        'deviation_distance_m': deviation_distance,
-                        'corridor_width_m': self.corridor.width_m,
-                        'threshold_m': self.config.corridor_deviation_threshold_m
-                    }
+                    EventType.CORRIDOR_DEVIATION, Severity.CRITICAL,
+                    deviation_distance,
+                    self.corridor.width_m,
+                    self.config.corridor_deviation_threshold_m
                 )
                 self.stats['corridor_deviations'] += 1
 
         # ===================================================================
-        # 7. 지오펜스 검사
+        # 4. 지오펜스 검사
         # ===================================================================
 
-        for zone in self.geofence_zones:
-            in_zone = zone.contains_point(
-                self.vessel_state.latitude,
-                self.vessel_state.longitude
-            )
+        lat = self.vessel_state.latitude
+        lon = self.vessel_state.longitude
+
+        # 후보 구역: 경계 상자가 현재 위치를 포함하는 구역의 인덱스 (구역 목록 순서 유지)
+        zones = self.geofence_zones
+        if self._zone_index is not None:
+            candidates = np.sort(self._zone_index.query(Point(lon, lat))).tolist()
+        else:
+            candidates = [k for k, zone in enumerate(zones) if zone.bbox_contains(lat, lon)]
+
+        for k in candidates:
+            zone = zones[k]
+            in_zone = zone.contains_point(lat, lon)
 
             if zone.zone_type == 'PROHIBITED' and in_zone:
                 # 금지 구역 진입
                 self._log_violation(
-                    event_type='GEOFENCE_VIOLATION',
-                    severity='CRITICAL',
-                    details={
-                        'zone_id': zone.zone_id,
-                        'zone_name': zone.zone_name,
-                        'zone_type': zone.zone_type
-                    }
+                    EventType.GEOFENCE_VIOLATION, Severity.CRITICAL,
+                    zone=k
                 )
                 self.stats['geofence_violations'] += 1
 
@@ -431,19 +784,15 @@ class SMRVesselSimulator:
                 # 제한 구역 진입 (속도 제한 확인)
                 if zone.max_speed_knots and self.vessel_state.speed > zone.max_speed_knots:
                     self._log_violation(
-                        event_type='SPEED_VIOLATION',
-                        severity='WARNING',
-                        details={
-                            'zone_id': zone.zone_id,
-                            'zone_name': zone.zone_name,
-                            'current_speed_knots': self.vessel_state.speed,
-                            'max_allowed_speed_knots': zone.max_speed_knots
-                        }
+                        EventType.SPEED_VIOLATION, Severity.WARNING,
+                        self.vessel_state.speed,
+                        zone.max_speed_knots,
+                        zone=k
                     )
                     self.stats['speed_violations'] += 1
 
         # ===================================================================
-        # 8. 중심선 포인트 도달 확인
+        # 5. 중심선 포인트 도달 확인
         # ===================================================================
 
         waypoint_arrival_threshold = 1000.0  # 1km
@@ -453,27 +802,83 @@ class SMRVesselSimulator:
 
         return self.vessel_state
 
-    def _log_violation(self, event_type: str, severity: str, details: Dict):
-        """위반 이벤트를 로그에 기록"""
+    def _cross_track_error(self, latitude: float, longitude: float) -> float:
+        """중심선까지의 거리 (미터) - 같은 위치에 대한 마지막 계산값을 재사용"""
 
-        event = ViolationEvent(
-            timestamp=self.simulation_time,
-            event_type=event_type,
-            severity=severity,
-            latitude=self.vessel_state.latitude,
-            longitude=self.vessel_state.longitude,
-            details=details
-        )
+        if self._cte_cache[0] == latitude and self._cte_cache[1] == longitude:
+            return self._cte_cache[2]
+
+        cte = self.corridor.distance_from_centerline(latitude, longitude)
+        self._cte_cache = (latitude, longitude, cte)
+        return cte
+
+    def _log_violation(
+        self,
+        event_type: EventType,
+        severity: Severity,
+        a: float = 0.0,
+        b: float = 0.0,
+        c: float = 0.0,
+        zone: int = -1
+    ):
+        """위반 이벤트를 로그에 기록 (필드 의미는 ViolationEvent 참조, zone은 geofence_zones 인덱스)"""
 
-        self.violation_log.append(event)
+        i = self._log_idx
+
+        self._log_time[i] = self.simulation_time
+        self._log_lat[i] = self.vessel_state.latitude
+        self._log_lon[i] = self.vessel_state.longitude
+        self._log_event[i] = event_type
+        self._log_severity[i] = severity
+        self._log_a[i] = a
+        self._log_b[i] = b
+        self._log_c[i] = c
+        self._log_zone[i] = zone
+
+        self._log_idx = (i + 1) % self._log_cap
+        if self._log_count < self._log_cap:
+            self._log_count += 1
+
+    def _log_window(self, last_n: Optional[int] = None) -> np.ndarray:
+        """보관 중인 이벤트의 버퍼 인덱스 (오래된 순)"""
+
+        n = self._log_count if last_n is None else min(last_n, self._log_count)
+        start = self._log_idx - n
+        return np.arange(start, start + n) % self._log_cap
 
     def get_current_state(self) -> VesselState:
         """현재 선박 상태 반환"""
         return self.vessel_state
 
-    def get_violation_log(self) -> List[ViolationEvent]:
-        """위반 이벤트 로그 반환"""
-        return self.violation_log
+    def get_violation_log(self, last_n: Optional[int] = None) -> List[ViolationEvent]:
+        """위반 이벤트 로그 반환 (오래된 순, last_n 지정 시 최근 n건)"""
+
+        idx = self._log_window(last_n)
+
+        # 열 단위로 한 번에 Python 값으로 변환
+        ts_us = self._log_time[idx].astype(np.int64).tolist()
+        zones = self.geofence_zones
+        event_zones = [zones[k] if k >= 0 else None for k in self._log_zone[idx].tolist()]
+
+        return [
+            ViolationEvent(*row)
+            for row in zip(
+                ts_us,
+                self._log_event[idx].tolist(),
+                self._log_severity[idx].tolist(),
+                self._log_lat[idx].tolist(),
+                self._log_lon[idx].tolist(),
+                self._log_a[idx].tolist(),
+                self._log_b[idx].tolist(),
+                self._log_c[idx].tolist(),
+                event_zones
+            )
+        ]
+
+    @property
+    def violation_log(self) -> List[ViolationEvent]:
+        """위반 이벤트 로그 (호환용 - get_violation_log()와 동일)"""
+        return self.get_violation_log()
 
     def get_statistics(self) -> Dict:
         """통계 반환"""
@@ -481,12 +886,240 @@ class SMRVesselSimulator:
 
     def export_violation_log(self, filepath: str):
         """위반 로그를 JSON 파일로 내보내기"""
-        log_data = [event.to_dict() for event in self.violation_log]
+        log_data = [event.to_dict() for event in self.get_violation_log()]
 
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(log_data, f, indent=2, ensure_ascii=False)
 
 
+# ============================================================================
+# SMR 함대 일괄 시뮬레이션 (SoA)
+# ============================================================================
+
+@njit(parallel=True, cache=True)
+def _step_smr_fleet(
+    lats, lons, courses, speeds, ctes, target_idx,
+    cl_offsets, cl_lats, cl_lons,
+    drift_east_ms, drift_north_ms, dt,
+    distance_moved
+):
+    """SMR 함대 전체를 한 스텝 진행 (선박별 독립 → prange 병렬)
+
+    SMRVesselSimulator.step의 수치 계산(_smr_step_core)과 동일하며, 배열은 제자리에서 갱신됩니다.
+    ctes에는 이동 후 위치의 중심선 거리가 기록되어 다음 스텝의 입력으로 재사용됩니다.
+
+    Args:
+        cl_offsets: 선박 i의 중심선 좌표는 cl_*[cl_offsets[i]:cl_offsets[i+1]]
+        distance_moved: 선박별 이동 거리 (미터, 출력)
+    """
+
+    for i in prange(lats.shape[0]):
+        start = cl_offsets[i]
+        end = cl_offsets[i + 1]
+
+        # 통로 끝에 도달 → 순환
+        if target_idx[i] >= end - start:
+            target_idx[i] = 0
+
+        t = start + target_idx[i]
+
+        (
+            new_lat, new_lon, new_course,
+            moved, _target_course, distance_to_target
+        ) = _smr_step_core(
+            lats[i], lons[i], courses[i], speeds[i],
+            cl_lats[t], cl_lons[t], ctes[i], dt,
+            SMR_CTE_GAIN, SMR_MAX_TURN_RATE_DEG_PER_SEC,
+            drift_east_ms, drift_north_ms
+        )
+
+        lats[i] = new_lat
+        lons[i] = new_lon
+        courses[i] = new_course
+        distance_moved[i] = moved
+
+        # 이동 후 중심선 거리
+        ctes[i] = _distance_to_polyline_m(
+            new_lat, new_lon,
+            cl_lats[start:end - 1], cl_lons[start:end - 1],
+            cl_lats[start + 1:end], cl_lons[start + 1:end]
+        )
+
+        # 중심선 포인트 도달 (1km 이내)
+        if distance_to_target < 1000.0:
+            target_idx[i] += 1
+
+
+class SMRFleetSimulator:
+    """
+    SMR 함대 일괄 시뮬레이터
+
+    개별 SMRVesselSimulator의 상태를 SoA(Structure of Arrays) 배열로 묶어
+    함대 전체의 수치 계산을 하나의 병렬 커널 호출로 진행합니다.
+    지오펜스 판정은 구역별로 함대 좌표를 한 번에 검사하고, 위반 이벤트는 각 시뮬레이터 로그에 기록합니다.
+    """
+
+    def __init__(self, simulators: List[SMRVesselSimulator]):
+        """
+        Args:
+            simulators: 묶을 SMR 선박 시뮬레이터 리스트
+        """
+        self.simulators = simulators
+        self.update_interval = simulators[0].update_interval if simulators else 10
+        self.simulation_time = datetime.utcnow()
+
+        # 선박 상태 (SoA)
+        self.lats = np.array([sim.vessel_state.latitude for sim in simulators], dtype=np.float64)
+        self.lons = np.array([sim.vessel_state.longitude for sim in simulators], dtype=np.float64)
+        self.courses = np.array([sim.vessel_state.course for sim in simulators], dtype=np.float64)
+        self.target_idx = np.array([sim.current_centerline_index for sim in simulators], dtype=np.int64)
+
+        # 통로 속도 제한 반영 속도 (스텝 중 일정)
+        self.speeds = np.array([
+            min(sim.config.cruise_speed_knots, sim.corridor.max_speed_knots) for sim in simulators
+        ], dtype=np.float64)
+
+        # 통로 (선박별 중심선 좌표를 하나의 배열로 연결)
+        corridors = [sim.corridor for sim in simulators]
+        self.cl_offsets = np.cumsum([0] + [len(c.centerline_coords) for c in corridors]).astype(np.int64)
+        self.cl_lats = np.array([lat for c in corridors for lat, _ in c.centerline_coords], dtype=np.float64)
+        self.cl_lons = np.array([lon for c in corridors for _, lon in c.centerline_coords], dtype=np.float64)
+
+        self.half_widths = np.array([c.width_m / 2 for c in corridors], dtype=np.float64)
+        self.deviation_thresholds = np.array([
+            sim.config.corridor_deviation_threshold_m for sim in simulators
+        ], dtype=np.float64)
+
+        # 현재 위치의 중심선 거리 (커널이 스텝마다 갱신)
+        self.ctes = np.array([
+            sim.corridor.distance_from_centerline(lat, lon)
+            for sim, lat, lon in zip(simulators, self.lats, self.lons)
+        ], dtype=np.float64)
+
+        self.distance_traveled_m = np.zeros(len(simulators), dtype=np.float64)
+        self._distance_moved = np.zeros(len(simulators), dtype=np.float64)
+
+        # 지오펜스 구역 → 해당 구역을 검사하는 선박 인덱스 / 각 선박의 geofence_zones 내 구역 인덱스
+        members: Dict[int, Tuple[GeofenceZone, List[int], List[int]]] = {}
+        for i, sim in enumerate(simulators):
+            for k, zone in enumerate(sim.geofence_zones):
+                _, idx, slots = members.setdefault(id(zone), (zone, [], []))
+                idx.append(i)
+                slots.append(k)
+        self._zone_members = [
+            (zone, np.array(idx, dtype=np.int64), np.array(slots, dtype=np.int64))
+            for zone, idx, slots in members.values()
+        ]
+
+        # 드리프트 속도 캐시 (공용 DeadReckoningEngine 계수 사용)
+        self._drift_key: Optional[Tuple] = None
+        self._drift_ms: Tuple[float, float] = (0.0, 0.0)
+
+    def step(
+        self,
+        delta_time_sec: Optional[int] = None,
+        wind_speed_knots: Optional[float] = None,
+        wind_direction_deg: Optional[float] = None,
+        current_speed_knots: Optional[float] = None,
+        current_direction_deg: Optional[float] = None
+    ):
+        """
+        함대 전체를 한 스텝 진행합니다. (환경 조건은 전 선박 공통)
+
+        Args:
+            delta_time_sec: 시간 증분 (None이면 update_interval 사용)
+            wind_speed_knots: 풍속 (노트)
+            wind_direction_deg: 풍향 (도)
+            current_speed_knots: 해류 속도 (노트)
+            current_direction_deg: 해류 방향 (도)
+        """
+
+        dt = delta_time_sec or self.update_interval
+        self.simulation_time += timedelta(seconds=dt)
+
+        drift_key = (wind_speed_knots, wind_direction_deg, current_speed_knots, current_direction_deg)
+        if drift_key != self._drift_key:
+            self._drift_key = drift_key
+            self._drift_ms = drift_velocity(*drift_key, _DR.wind_drift_coef, _DR.current_drift_coef)
+
+        _step_smr_fleet(
+            self.lats, self.lons, self.courses, self.speeds, self.ctes, self.target_idx,
+            self.cl_offsets, self.cl_lats, self.cl_lons,
+            self._drift_ms[0], self._drift_ms[1], float(dt),
+            self._distance_moved
+        )
+        self.distance_traveled_m += self._distance_moved
+
+        # 통로 이탈 감지
+        deviating = (self.ctes > self.half_widths) & (self.ctes > self.deviation_thresholds)
+
+        for i in np.flatnonzero(deviating):
+            sim = self._sync_state(i)
+            sim._log_violation(
+                EventType.CORRIDOR_DEVIATION, Severity.CRITICAL,
+                self.ctes[i],
+                sim.corridor.width_m,
+                sim.config.corridor_deviation_threshold_m
+            )
+            sim.stats['corridor_deviations'] += 1
+
+        # 지오펜스 검사 (구역별 일괄 판정)
+        for zone, idx, slots in self._zone_members:
+            if zone.zone_type == 'PROHIBITED':
+                inside = zone.contains_points(self.lats[idx], self.lons[idx])
+
+                for i, k in zip(idx[inside].tolist(), slots[inside].tolist()):
+                    sim = self._sync_state(i)
+                    sim._log_violation(
+                        EventType.GEOFENCE_VIOLATION, Severity.CRITICAL,
+                        zone=k
+                    )
+                    sim.stats['geofence_violations'] += 1
+
+            elif zone.zone_type == 'RESTRICTED' and zone.max_speed_knots:
+                fast = self.speeds[idx] > zone.max_speed_knots
+                if not fast.any():
+                    continue
+                idx = idx[fast]
+                slots = slots[fast]
+
+                inside = zone.contains_points(self.lats[idx], self.lons[idx])
+
+                for i, k in zip(idx[inside].tolist(), slots[inside].tolist()):
+                    sim = self._sync_state(i)
+                    sim._log_violation(
+                        EventType.SPEED_VIOLATION, Severity.WARNING,
+                        self.speeds[i],
+                        zone.max_speed_knots,
+                        zone=k
+                    )
+                    sim.stats['speed_violations'] += 1
+
+    def _sync_state(self, i: int) -> SMRVesselSimulator:
+        """선박 i의 배열 상태를 해당 시뮬레이터에 반영"""
+
+        sim = self.simulators[i]
+        state = sim.vessel_state
+
+        state.latitude = float(self.lats[i])
+        state.longitude = float(self.lons[i])
+        state.course = float(self.courses[i])
+        state.heading = state.course
+        state.speed = float(self.speeds[i])
+        state.timestamp = self.simulation_time
+
+        sim.current_centerline_index = int(self.target_idx[i])
+        sim.simulation_time = self.simulation_time
+        sim.stats['total_distance_traveled_m'] += float(self.distance_traveled_m[i])
+        self.distance_traveled_m[i] = 0.0
+
+        return sim
+
+    def sync_states(self) -> List[VesselState]:
+        """배열 상태를 각 시뮬레이터의 VesselState에 반영하고 반환"""
+        return [self._sync_state(i).vessel_state for i in range(len(self.simulators))]
+
+
 # ============================================================================
 # 사전 정의된 통로 및 지오펜스
 # ============================================================================
@@ -629,7 +1262,7 @@ if __name__ == "__main__":
         print(f"  통로 이탈: {deviation:.0f}m (폭: {corridor.width_m/1000:.1f}km)")
 
         # 위반 확인
-        recent_violations = simulator.get_violation_log()
+        recent_violations = simulator.get_violation_log(last_n=1)
         if recent_violations:
             latest = recent_violations[-1]
             if (simulator.simulation_time - latest.timestamp).total_seconds() < 301:
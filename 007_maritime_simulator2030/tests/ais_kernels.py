@@ -0,0 +1,54 @@
+"""
+AIS 배치 커널
+메시지 N건을 배열 단위로 처리하는 Numba 커널
+
+- summarize_positions: 위치 보고 배열(위도 / 경도 / SOG)의 최소 / 최대 / 평균
+"""
+import sys
+from pathlib import Path
+
+# src/numba_compat 공유 - numba 미설치 시 순수 Python으로 동작
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from numba_compat import njit
+
+
+@njit(cache=True)
+def summarize_positions(lats, lons, sogs):
+    """
+    위치 보고 N건 요약 (N >= 1)
+
+    Args:
+        lats / lons / sogs: 같은 길이의 float32 배열 (유효 구간만 슬라이스해 전달)
+
+    Returns:
+        (위도 최소, 위도 최대, 경도 최소, 경도 최대, SOG 최소, SOG 최대, SOG 평균)
+    """
+    lat_min = lat_max = lats[0]
+    lon_min = lon_max = lons[0]
+    sog_min = sog_max = sogs[0]
+    sog_sum = 0.0
+
+    for i in range(lats.shape[0]):
+        lat = lats[i]
+        lon = lons[i]
+        sog = sogs[i]
+
+        if lat < lat_min:
+            lat_min = lat
+        elif lat > lat_max:
+            lat_max = lat
+        if lon < lon_min:
+            lon_min = lon
+        elif lon > lon_max:
+            lon_max = lon
+        if sog < sog_min:
+            sog_min = sog
+        elif sog > sog_max:
+            sog_max = sog
+        sog_sum += sog
+
+    return (
+        float(lat_min), float(lat_max),
+        float(lon_min), float(lon_max),
+        float(sog_min), float(sog_max), sog_sum / lats.shape[0],
+    )
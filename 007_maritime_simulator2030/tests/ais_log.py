@@ -0,0 +1,46 @@
+"""
+AIS 테스트 출력 헬퍼
+테스트 스크립트 공용 콘솔 출력 유틸리티
+
+- now_hms: 현재 시각 문자열 (초 단위 캐시)
+- emit: 여러 줄 블록을 UTF-8 bytes로 한 번에 출력 (텍스트 레이어 인코딩 생략)
+"""
+import sys
+import time
+
+_TIME_FMT = '%H:%M:%S'
+
+# 마지막으로 포맷한 초 / 문자열
+_last_sec = -1
+_last_hms = ''
+
+
+def now_hms() -> str:
+    """현재 시각 (HH:MM:SS) - 같은 초 안에서는 strftime을 다시 호출하지 않음"""
+    global _last_sec, _last_hms
+
+    sec = int(time.time())
+    if sec != _last_sec:
+        _last_hms = time.strftime(_TIME_FMT, time.localtime(sec))
+        _last_sec = sec
+    return _last_hms
+
+
+def emit(lines):
+    """
+    여러 줄을 한 번에 출력 - print 호출마다 드는 stdout 잠금 / 인코딩을 블록당 1회로
+
+    블록을 UTF-8로 한 번 인코딩해 바이너리 버퍼에 직접 기록
+    (콘솔 인코딩과 무관하게 UTF-8 - 이모지 출력에 래퍼 불필요)
+    바이너리 버퍼가 없는 스트림(IDE / 캡처 등)은 텍스트로 출력
+    """
+    payload = "\n".join(lines) + "\n"
+    out = sys.stdout
+    buffer = getattr(out, 'buffer', None)
+    if buffer is None:
+        out.write(payload)
+        return
+
+    out.flush()  # 앞서 print한 내용과 순서 유지
+    buffer.write(payload.encode('utf-8'))
+    buffer.flush()  # 텍스트 레이어의 line_buffering은 바이너리 쓰기에 적용되지 않음
@@ -0,0 +1,136 @@
+"""
+AIS 메시지 파싱 헬퍼
+테스트 스크립트 공용 JSON 디코더 / 프레임 수신 유틸리티
+
+- loads: orjson이 있으면 사용 (없으면 표준 json)
+- MAX_FRAME_BYTES: WebSocket 수신 프레임 상한 (AIS 메시지는 수 KB)
+- parse_ais: 수신 프레임에서 (MMSI, 메시지 타입, 선박 타입, 위도, 경도, SOG) 튜플만 추출
+  (simdjson이 있으면 필요한 필드만 읽고 dict를 만들지 않음)
+- AISFrame: parse_ais 결과를 여러 분류기가 공유 (전체 dict는 요청 시에만 생성)
+- iter_frames: 수신 프레임을 UTF-8 디코드 없이 bytes로 순회
+"""
+import json
+import math
+
+from websockets.exceptions import ConnectionClosedOK
+
+# WebSocket 수신 프레임 상한 - 수신 버퍼가 불필요하게 커지지 않도록 1 MiB로 제한
+MAX_FRAME_BYTES = 2 ** 20
+
+# JSON 파서: orjson이 있으면 사용 (없으면 표준 json) - 메시지마다 호출되는 핫 루프
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+# simdjson 파서 (pysimdjson, 선택) - 1개를 재사용, 없으면 loads로 전체 파싱
+try:
+    import simdjson
+    _parser = simdjson.Parser()
+except ImportError:
+    _parser = None
+
+
+def _number(value):
+    """JSON 숫자 → float (숫자가 아니면 NaN)"""
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    return math.nan
+
+
+def parse_ais(raw):
+    """
+    AIS 메시지의 핵심 필드만 튜플로 추출
+
+    simdjson이 있으면 파싱한 문서에서 해당 필드만 읽음 (Python dict 트리를 만들지 않음)
+    위치는 모든 메시지 타입에 공통인 MetaData의 latitude / longitude를 사용
+
+    Returns:
+        (mmsi, message_type, ship_type, latitude, longitude, sog)
+        - mmsi: 정수 (없거나 정수가 아니면 None)
+        - ship_type: ShipStaticData의 선박 타입 코드 (없거나 정수가 아니면 -1)
+        - latitude / longitude: 없으면 NaN
+        - sog: PositionReport의 대지속력 (knots, 없으면 NaN)
+
+    Raises:
+        ValueError: JSON 파싱 실패
+    """
+    doc = _parser.parse(raw) if _parser is not None else loads(raw)
+
+    try:
+        msg_type = doc.get("MessageType", "Unknown")
+        meta = doc.get("MetaData") or {}
+
+        mmsi = meta.get("MMSI")
+        if type(mmsi) is not int:
+            mmsi = None
+
+        ship_type = -1
+        if msg_type == "ShipStaticData":
+            try:
+                ship_type = doc["Message"]["ShipStaticData"]["Type"]
+            except (KeyError, TypeError):
+                pass
+            if type(ship_type) is not int:
+                ship_type = -1
+
+        sog = math.nan
+        if msg_type == "PositionReport":
+            try:
+                sog = _number(doc["Message"]["PositionReport"]["Sog"])
+            except (KeyError, TypeError):
+                pass
+
+        return (
+            mmsi,
+            msg_type,
+            ship_type,
+            _number(meta.get("latitude")),
+            _number(meta.get("longitude")),
+            sog,
+        )
+
+    except (AttributeError, TypeError):
+        # 최상위 / MetaData가 객체가 아닌 메시지
+        return None, "Unknown", -1, math.nan, math.nan, math.nan
+
+
+class AISFrame:
+    """
+    수신 프레임 1건 (parse_ais 결과를 분류기 간 공유)
+
+    mmsi / msg_type / ship_type / lat / lon / sog는 parse_ais 튜플 값
+    message는 처음 접근할 때만 전체 dict로 파싱 (탐지된 메시지의 상세 출력용)
+    """
+
+    __slots__ = ('raw', 'mmsi', 'msg_type', 'ship_type', 'lat', 'lon', 'sog', '_message')
+
+    def __init__(self, raw, fields):
+        self.raw = raw
+        self.mmsi, self.msg_type, self.ship_type, self.lat, self.lon, self.sog = fields
+        self._message = None
+
+    @property
+    def message(self) -> dict:
+        """전체 메시지 dict"""
+        if self._message is None:
+            self._message = loads(self.raw)
+        return self._message
+
+
+async def iter_frames(websocket):
+    """
+    수신 프레임을 bytes 그대로 순회
+
+    텍스트 프레임의 UTF-8 디코드/검증을 생략 - orjson/simdjson/json 모두 bytes를 바로 파싱
+    정상 종료(ConnectionClosedOK) 시 순회 종료 (async for websocket과 동일)
+    """
+    while True:
+        try:
+            yield await websocket.recv(decode=False)
+        except ConnectionClosedOK:
+            return
+
@@ -0,0 +1,239 @@
+"""
+AIS 스트림 공용 러너
+WebSocket 연결 1개로 여러 분류기(테스트)를 함께 실행
+
+- StreamClassifier: 분류기 기본 클래스 (대상 소개 / 프레임 처리 / 최종 통계)
+- run_stream: 연결 → 구독 → 수신 루프 → 분류기별 최종 통계
+- main: 스크립트 진입점 공용 처리 (콘솔 인코딩 / 제목 / 이벤트 루프)
+
+수신 프레임은 parse_ais로 한 번만 파싱 / classify로 한 번만 분류하고
+모든 분류기가 같은 AISFrame과 분류 태그를 공유
+
+사용법:
+    python ais_stream_runner.py
+    → 연결 테스트 / Q-Max 추적 / LNG 탱커 탐지를 한 연결에서 동시에 실행
+
+    PYTHON_JIT=1 PYTHONOPTIMIZE=2 python3.13 ais_stream_runner.py
+    → CPython 3.13+ JIT 지원 빌드에서 수신 루프 JIT 적용 (assert / docstring 제거)
+"""
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+import json
+import os
+import sys
+from pathlib import Path
+
+import websockets
+from websockets.asyncio.client import connect
+from dotenv import load_dotenv
+
+from ais_classify import classify
+from ais_parse import MAX_FRAME_BYTES, AISFrame, iter_frames, parse_ais
+
+# .env 파일 로드
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+AISSTREAM_URI = "wss://stream.aisstream.io/v0/stream"
+
+# 통합 실행 시 모니터링 시간 (개별 테스트 중 가장 긴 값)
+COMBINED_DURATION_S = 90
+
+
+class StreamClassifier(ABC):
+    """
+    스트림 분류기 기본 클래스
+
+    message_types에 속한 프레임만 handle()로 전달 (message_count는 러너가 증가)
+    분류 태그(ais_classify.classify 결과)는 러너가 메시지마다 1회 계산해 함께 전달
+    done이 True가 되면 이후 프레임을 받지 않음
+    handle / report는 하위 클래스에서 반드시 구현 (미구현 시 생성 단계에서 TypeError)
+    elapsed()는 수신 시작 후 경과 시간 (이벤트 루프 단조 시계 - 시스템 시각 조회 없음)
+    """
+
+    name = ""
+    message_types = ("PositionReport", "ShipStaticData")
+
+    def __init__(self):
+        self.message_count = 0
+        self.done = False
+        self._clock = None
+        self._t0 = 0.0
+
+    def start(self, loop):
+        """수신 시작 시각 기록 (러너가 수신 루프 직전에 호출)"""
+        self._clock = loop.time
+        self._t0 = loop.time()
+
+    def elapsed(self) -> float:
+        """수신 시작 후 경과 시간 (초)"""
+        if self._clock is None:
+            return 0.0
+        return self._clock() - self._t0
+
+    def describe(self):
+        """탐지 대상 소개 출력 (연결 전)"""
+
+    @abstractmethod
+    def handle(self, frame: AISFrame, tag: int):
+        """프레임 1건 처리 (tag: TAG_QMAX / TAG_LNG 비트 플래그)"""
+
+    @abstractmethod
+    def report(self):
+        """최종 통계 출력"""
+
+
+def _dispatch(raw, classifiers):
+    """수신 프레임 1건을 분류기에 전달 (파싱 / 분류 1회)"""
+    try:
+        fields = parse_ais(raw)
+    except ValueError:
+        print(f"⚠️  JSON 파싱 실패: {raw[:100]}")
+        return
+
+    frame = AISFrame(raw, fields)
+    msg_type = frame.msg_type
+    tag = classify(frame.mmsi, frame.ship_type)
+    for classifier in classifiers:
+        if classifier.done or msg_type not in classifier.message_types:
+            continue
+
+        classifier.message_count += 1
+        try:
+            classifier.handle(frame, tag)
+        except Exception as e:
+            print(f"⚠️  메시지 처리 오류: {e}")
+
+
+async def run_stream(classifiers, duration_s, mmsi_filter=None):
+    """
+    AISStream 구독 후 duration_s초 동안 수신 프레임을 분류기들에 전달
+
+    Args:
+        classifiers: StreamClassifier 리스트
+        duration_s: 모니터링 시간 (초) - 모든 분류기가 done이면 조기 종료
+        mmsi_filter: 서버 측 MMSI 필터 (FiltersShipMMSI, None이면 전체 선박)
+    """
+    api_key = os.getenv('AISSTREAM_API_KEY')
+
+    if not api_key or api_key == "your_api_key_here":
+        print("❌ API 키가 설정되지 않았습니다!")
+        print(f"현재 API 키: {api_key}")
+        return
+
+    print(f"✅ API 키 로드됨: {api_key[:10]}...")
+
+    for classifier in classifiers:
+        classifier.describe()
+
+    # 구독 메시지 타입 = 분류기 요청 타입의 합집합 (순서 유지)
+    message_types = []
+    for classifier in classifiers:
+        for msg_type in classifier.message_types:
+            if msg_type not in message_types:
+                message_types.append(msg_type)
+
+    try:
+        print(f"\n🔌 WebSocket 연결 시도: {AISSTREAM_URI}")
+
+        async with connect(AISSTREAM_URI, compression=None, max_size=MAX_FRAME_BYTES) as websocket:
+            print("✅ WebSocket 연결 성공!")
+
+            # 구독 메시지 전송
+            subscribe_message = {
+                "APIKey": api_key,
+                "BoundingBoxes": [[[-90, -180], [90, 180]]],  # 전 세계
+                "FilterMessageTypes": message_types
+            }
+            if mmsi_filter:
+                # AISStream은 MMSI를 문자열 리스트로 받음
+                subscribe_message["FiltersShipMMSI"] = [str(mmsi) for mmsi in mmsi_filter]
+
+            print(f"\n📡 구독 메시지 전송:")
+            print(f"  - BoundingBox: 전 세계")
+            print(f"  - MessageTypes: {', '.join(message_types)}")
+            print(f"  - MMSI 필터: {str(len(mmsi_filter)) + '척 (서버 측)' if mmsi_filter else '없음'}")
+
+            await websocket.send(json.dumps(subscribe_message))
+            print("✅ 구독 메시지 전송 완료!")
+
+            print(f"\n⏳ 메시지 수신 대기 중... ({duration_s}초 동안 모니터링)")
+            print("=" * 80)
+
+            loop = asyncio.get_running_loop()
+            for classifier in classifiers:
+                classifier.start(loop)
+
+            try:
+                # 타임아웃 / 조기 종료 시에도 프레임 생성기를 바로 닫음
+                async with asyncio.timeout(duration_s):
+                    async with contextlib.aclosing(iter_frames(websocket)) as frames:
+                        async for raw in frames:
+                            _dispatch(raw, classifiers)
+                            if all(classifier.done for classifier in classifiers):
+                                break
+
+            except asyncio.TimeoutError:
+                print(f"\n⏱️  {duration_s}초 타임아웃 - 테스트 종료")
+
+            # 분류기별 최종 통계
+            for classifier in classifiers:
+                if len(classifiers) > 1:
+                    print(f"\n\n🧪 [{classifier.name}]")
+                classifier.report()
+
+    except websockets.exceptions.InvalidStatus as e:
+        print(f"❌ WebSocket 연결 실패 - 잘못된 상태 코드: {e}")
+        print(f"API 키가 올바른지 확인하세요!")
+
+    except websockets.exceptions.WebSocketException as e:
+        print(f"❌ WebSocket 오류: {e}")
+
+    except Exception as e:
+        print(f"❌ 예상치 못한 오류: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+async def run_all():
+    """연결 테스트 / Q-Max 추적 / LNG 탱커 탐지를 한 연결에서 실행"""
+    from test_ais_connection import ConnectivityLogger
+    from test_qmax_mmsi import QmaxDetector
+    from test_ship_type_filter import LngTankerDetector
+
+    # 서버 측 MMSI 필터는 다른 분류기의 수신까지 막으므로 사용하지 않음
+    await run_stream(
+        [ConnectivityLogger(), QmaxDetector(), LngTankerDetector()],
+        duration_s=COMBINED_DURATION_S,
+    )
+
+
+def main(title, test):
+    """
+    테스트 스크립트 진입점 - 콘솔 인코딩 설정 / 제목 출력 / 이벤트 루프 실행
+
+    Args:
+        title: 제목 줄
+        test: 실행할 테스트 코루틴 함수 (인자 없음)
+    """
+    # Windows 콘솔 인코딩 설정 - 래퍼 없이 기존 스트림을 UTF-8로 재설정
+    # (PYTHONUTF8=1 또는 PYTHONIOENCODING=utf-8 환경에서는 이미 UTF-8)
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+
+    # 이벤트 루프: uvloop이 있으면 사용 (Windows 등 미설치 시 기본 asyncio 루프)
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+
+    run(test())
+
+
+if __name__ == "__main__":
+    main("🧪 AISStream 통합 테스트 (연결 / Q-Max / LNG 탱커)", run_all)
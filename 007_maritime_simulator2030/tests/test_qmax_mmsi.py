@@ -1,198 +1,185 @@
 """
 Q-Max MMSI 리스트로 실제 선박 추적 테스트
 """
-import asyncio
-import websockets
-import json
-import os
-from datetime import datetime
-from pathlib import Path
-from dotenv import load_dotenv
-
-# .env 파일 로드
-env_path = Path(__file__).parent / '.env'
-load_dotenv(dotenv_path=env_path)
-
-# Q-Max MMSI 리스트 (src/ais_client.py와 동일)
-QMAX_MMSI_LIST = [
-    "538003212",  # Mozah
-    "538003354",  # Aamira
-    "538003295",  # Al Samriya
-    "538003301",  # Bu Samra
-    "538003356",  # Al Mayeda
-    "538003365",  # Mekaines
-    "538003357",  # Al Mafyar
-    "538003300",  # Umm Slal
-    "538003293",  # Al Ghuwairiya
-    "538003294",  # Lijmiliya
-    "538003355",  # Al Dafna
-    "538003348",  # Shagra
-    "538003346",  # Zarga
-    "538003362",  # Rasheeda
-]
+import math
+
+import numpy as np
+
+from ais_classify import QMAX_MMSI, QMAX_MMSI_LIST, TAG_QMAX
+from ais_kernels import summarize_positions
+from ais_log import emit, now_hms
+from ais_stream_runner import StreamClassifier, main, run_stream
+
+# 서버 측 MMSI 필터 (FiltersShipMMSI) - 대상 외 선박 메시지를 아예 수신하지 않음
+# 서버가 필터를 무시하는 경우에도 클라이언트 측 판정은 그대로 유지
+USE_SERVER_MMSI_FILTER = True
+
+# 위치 보고 배열 초기 용량 (가득 차면 2배로 확장)
+POSITION_CAPACITY = 1024
+
+
+class QmaxDetector(StreamClassifier):
+    """Q-Max 선박 탐지 - 14척 모두 발견하면 종료"""
+
+    name = "Q-Max 선박 실시간 추적"
+
+    def __init__(self):
+        super().__init__()
+        self.qmax_found = {}  # MMSI -> vessel info
+        self.qmax_message_count = 0
+        self.other_count = 0
+
+        # Q-Max 위치 보고 (struct-of-arrays) - 메시지마다 dict를 만들지 않고 배열에 바로 기록
+        self.lats = np.empty(POSITION_CAPACITY, np.float32)
+        self.lons = np.empty(POSITION_CAPACITY, np.float32)
+        self.sogs = np.empty(POSITION_CAPACITY, np.float32)
+        self.position_count = 0
+
+    def describe(self):
+        print(f"\n🔍 추적 대상 Q-Max 선박: {len(QMAX_MMSI_LIST)}척")
+        print(f"MMSI 리스트: {', '.join(map(str, QMAX_MMSI_LIST[:5]))}... (총 {len(QMAX_MMSI_LIST)}척)")
+
+    def handle(self, frame, tag):
+        # 파싱된 MMSI만 사용 - Q-Max 선박일 때만 전체 메시지 변환
+        mmsi = frame.mmsi
+        msg_type = frame.msg_type
+
+        # Q-Max 선박인지 확인 (분류 태그로만 분기)
+        if tag & TAG_QMAX:
+            self.qmax_message_count += 1
+
+            if msg_type == "PositionReport":
+                self._record_position(frame)
+
+            # 처음 발견한 선박
+            if mmsi not in self.qmax_found:
+                self._report_first_seen(mmsi, msg_type, frame.message)
+        else:
+            self.other_count += 1
+
+        # 진행 상황 (1000개마다)
+        if self.message_count % 1000 == 0:
+            print(f"\n📊 진행 상황: 총 {self.message_count}개 메시지 (Q-Max 발견: {len(self.qmax_found)}/14척, Q-Max 메시지: {self.qmax_message_count}개)")
+
+    def _record_position(self, frame):
+        """위치 보고 1건을 배열에 추가 (위도 / 경도 / SOG 중 하나라도 없으면 생략)"""
+        lat = frame.lat
+        lon = frame.lon
+        sog = frame.sog
+        if math.isnan(lat) or math.isnan(lon) or math.isnan(sog):
+            return
+
+        i = self.position_count
+        if i == self.lats.shape[0]:
+            capacity = 2 * i
+            self.lats = np.resize(self.lats, capacity)
+            self.lons = np.resize(self.lons, capacity)
+            self.sogs = np.resize(self.sogs, capacity)
+
+        self.lats[i] = lat
+        self.lons[i] = lon
+        self.sogs[i] = sog
+        self.position_count = i + 1
+
+    def _report_first_seen(self, mmsi, msg_type, message):
+        """처음 발견한 Q-Max 선박 기록 / 출력"""
+
+        # 메시지 본문 (Message 아래 키는 MessageType과 동일)
+        try:
+            payload = message["Message"][msg_type]
+        except KeyError:
+            payload = None
+
+        name = "Unknown"
+
+        if msg_type == "PositionReport":
+            name = message["MetaData"].get("ShipName", "Unknown")
+        elif msg_type == "ShipStaticData" and payload is not None:
+            name = payload.get("Name", "Unknown").strip()
+
+        self.qmax_found[mmsi] = {
+            'name': name,
+            'first_seen': msg_type
+        }
+
+        out = [
+            f"\n🎯 Q-Max 발견! #{len(self.qmax_found)}/14",
+            f"  ⏰ 시각: {now_hms()} (+{self.elapsed():.1f}초)",
+            f"  🆔 MMSI: {mmsi}",
+            f"  🚢 선명: {name}",
+            f"  📋 메시지 타입: {msg_type}",
+        ]
+
+        # 위치 정보 출력 (PositionReport인 경우)
+        if msg_type == "PositionReport" and payload is not None:
+            pos = payload
+            lat = pos.get("Latitude")
+            lon = pos.get("Longitude")
+            sog = pos.get("Sog")
+            cog = pos.get("Cog")
+
+            if lat and lon:
+                out.append(f"  📍 위치: ({lat:.4f}, {lon:.4f})")
+                out.append(f"  🧭 COG: {cog:.1f}° | SOG: {sog:.1f} knots")
+
+        out.append("-" * 80)
+
+        # 14척 모두 발견하면 종료
+        if len(self.qmax_found) >= 14:
+            out.append("\n✅ 모든 Q-Max 선박 발견! 테스트 종료")
+            self.done = True
+
+        emit(out)
+
+    def report(self):
+        qmax_found = self.qmax_found
+
+        print("\n" + "=" * 80)
+        print("📊 최종 통계")
+        print("=" * 80)
+        print(f"총 수신 메시지: {self.message_count}개")
+        print(f"발견된 Q-Max 선박: {len(qmax_found)}/14척")
+        print(f"Q-Max 메시지 수: {self.qmax_message_count}개")
+        print(f"기타 선박 메시지: {self.other_count}개")
+
+        # 위치 보고 요약 (Numba 커널로 일괄 집계)
+        n = self.position_count
+        if n > 0:
+            lat_min, lat_max, lon_min, lon_max, sog_min, sog_max, sog_avg = summarize_positions(
+                self.lats[:n], self.lons[:n], self.sogs[:n]
+            )
+            print(f"\n📍 Q-Max 위치 보고 요약 ({n}건):")
+            print(f"  위도: {lat_min:.4f} ~ {lat_max:.4f}")
+            print(f"  경도: {lon_min:.4f} ~ {lon_max:.4f}")
+            print(f"  SOG: 평균 {sog_avg:.1f} knots (최소 {sog_min:.1f} / 최대 {sog_max:.1f})")
+
+        # 발견된 Q-Max 선박 목록
+        if len(qmax_found) > 0:
+            print(f"\n✅ 발견된 Q-Max 선박:")
+            for i, (mmsi, info) in enumerate(qmax_found.items(), 1):
+                print(f"  {i}. {info['name']} (MMSI: {mmsi})")
+        else:
+            print(f"\n⚠️  Q-Max 선박을 찾지 못했습니다.")
+            print(f"가능한 원인:")
+            print(f"  1. Q-Max 선박이 현재 AIS 신호를 송출하지 않음")
+            print(f"  2. 선박이 항만에 정박 중이거나 통신 범위 밖")
+            print(f"  3. 일시적인 통신 장애")
+
+        # 발견하지 못한 선박 목록
+        if len(qmax_found) < 14:
+            print(f"\n❌ 발견하지 못한 Q-Max 선박:")
+            missing = QMAX_MMSI.difference(qmax_found)
+            for mmsi in missing:
+                print(f"  - MMSI: {mmsi}")
+
 
 async def test_qmax_tracking():
     """Q-Max 선박 추적 테스트"""
-
-    api_key = os.getenv('AISSTREAM_API_KEY')
-
-    if not api_key or api_key == "your_api_key_here":
-        print("❌ API 키가 설정되지 않았습니다!")
-        return
-
-    print(f"✅ API 키 로드됨: {api_key[:10]}...")
-
-    uri = "wss://stream.aisstream.io/v0/stream"
-
-    print(f"\n🔍 추적 대상 Q-Max 선박: {len(QMAX_MMSI_LIST)}척")
-    print(f"MMSI 리스트: {', '.join(QMAX_MMSI_LIST[:5])}... (총 {len(QMAX_MMSI_LIST)}척)")
-
-    try:
-        print(f"\n🔌 WebSocket 연결 시도: {uri}")
-
-        async with websockets.connect(uri) as websocket:
-            print("✅ WebSocket 연결 성공!")
-
-            # 구독 메시지 전송
-            subscribe_message = {
-                "APIKey": api_key,
-                "BoundingBoxes": [[[-90, -180], [90, 180]]],  # 전 세계
-                "FilterMessageTypes": ["PositionReport", "ShipStaticData"]
-            }
-
-            print(f"\n📡 구독 메시지 전송:")
-            print(f"  - BoundingBox: 전 세계")
-            print(f"  - MessageTypes: PositionReport, ShipStaticData")
-
-            subscribe_message_json = json.dumps(subscribe_message)
-            await websocket.send(subscribe_message_json)
-            print("✅ 구독 메시지 전송 완료!")
-
-            print("\n⏳ Q-Max 선박 탐지 중... (90초 동안 모니터링)")
-            print("=" * 80)
-
-            message_count = 0
-            qmax_found = {}  # MMSI -> vessel info
-            qmax_message_count = 0
-            other_count = 0
-
-            # 90초 동안 메시지 수신
-            try:
-                async with asyncio.timeout(90):
-                    async for message_json in websocket:
-                        message_count += 1
-
-                        try:
-                            message = json.loads(message_json)
-
-                            msg_type = message.get("MessageType", "Unknown")
-                            mmsi = None
-
-                            if "MetaData" in message and "MMSI" in message["MetaData"]:
-                                mmsi = str(message["MetaData"]["MMSI"])
-
-                            # Q-Max 선박인지 확인
-                            if mmsi and mmsi in QMAX_MMSI_LIST:
-                                qmax_message_count += 1
-
-                                # 처음 발견한 선박
-                                if mmsi not in qmax_found:
-                                    name = "Unknown"
-
-                                    if msg_type == "PositionReport":
-                                        name = message.get("MetaData", {}).get("ShipName", "Unknown")
-                                    elif msg_type == "ShipStaticData" and "Message" in message and "ShipStaticData" in message["Message"]:
-                                        name = message["Message"]["ShipStaticData"].get("Name", "Unknown").strip()
-
-                                    qmax_found[mmsi] = {
-                                        'name': name,
-                                        'first_seen': msg_type
-                                    }
-
-                                    print(f"\n🎯 Q-Max 발견! #{len(qmax_found)}/14")
-                                    print(f"  ⏰ 시각: {datetime.now().strftime('%H:%M:%S')}")
-                                    print(f"  🆔 MMSI: {mmsi}")
-                                    print(f"  🚢 선명: {name}")
-                                    print(f"  📋 메시지 타입: {msg_type}")
-
-                                    # 위치 정보 출력 (PositionReport인 경우)
-                                    if msg_type == "PositionReport" and "Message" in message and "PositionReport" in message["Message"]:
-                                        pos = message["Message"]["PositionReport"]
-                                        lat = pos.get("Latitude")
-                                        lon = pos.get("Longitude")
-                                        sog = pos.get("Sog")
-                                        cog = pos.get("Cog")
-
-                                        if lat and lon:
-                                            print(f"  📍 위치: ({lat:.4f}, {lon:.4f})")
-                                            print(f"  🧭 COG: {cog:.1f}° | SOG: {sog:.1f} knots")
-
-                                    print("-" * 80)
-
-                                    # 14척 모두 발견하면 종료
-                                    if len(qmax_found) >= 14:
-                                        print("\n✅ 모든 Q-Max 선박 발견! 테스트 종료")
-                                        break
-                            else:
-                                other_count += 1
-
-                            # 진행 상황 (1000개마다)
-                            if message_count % 1000 == 0:
-                                print(f"\n📊 진행 상황: 총 {message_count}개 메시지 (Q-Max 발견: {len(qmax_found)}/14척, Q-Max 메시지: {qmax_message_count}개)")
-
-                        except json.JSONDecodeError:
-                            print(f"⚠️  JSON 파싱 실패")
-                        except Exception as e:
-                            print(f"⚠️  메시지 처리 오류: {e}")
-
-            except asyncio.TimeoutError:
-                print("\n⏱️  90초 타임아웃 - 테스트 종료")
-
-            # 최종 통계
-            print("\n" + "=" * 80)
-            print("📊 최종 통계")
-            print("=" * 80)
-            print(f"총 수신 메시지: {message_count}개")
-            print(f"발견된 Q-Max 선박: {len(qmax_found)}/14척")
-            print(f"Q-Max 메시지 수: {qmax_message_count}개")
-            print(f"기타 선박 메시지: {other_count}개")
-
-            # 발견된 Q-Max 선박 목록
-            if len(qmax_found) > 0:
-                print(f"\n✅ 발견된 Q-Max 선박:")
-                for i, (mmsi, info) in enumerate(qmax_found.items(), 1):
-                    print(f"  {i}. {info['name']} (MMSI: {mmsi})")
-            else:
-                print(f"\n⚠️  Q-Max 선박을 찾지 못했습니다.")
-                print(f"가능한 원인:")
-                print(f"  1. Q-Max 선박이 현재 AIS 신호를 송출하지 않음")
-                print(f"  2. 선박이 항만에 정박 중이거나 통신 범위 밖")
-                print(f"  3. 일시적인 통신 장애")
-
-            # 발견하지 못한 선박 목록
-            if len(qmax_found) < 14:
-                print(f"\n❌ 발견하지 못한 Q-Max 선박:")
-                found_mmsi = set(qmax_found.keys())
-                missing = set(QMAX_MMSI_LIST) - found_mmsi
-                for mmsi in missing:
-                    print(f"  - MMSI: {mmsi}")
-
-    except websockets.exceptions.InvalidStatusCode as e:
-        print(f"❌ WebSocket 연결 실패: {e}")
-    except Exception as e:
-        print(f"❌ 예상치 못한 오류: {e}")
-        import traceback
-        traceback.print_exc()
+    await run_stream(
+        [QmaxDetector()],
+        duration_s=90,
+        mmsi_filter=QMAX_MMSI_LIST if USE_SERVER_MMSI_FILTER else None,
+    )
 
 if __name__ == "__main__":
-    import sys
-    import io
-
-    # Windows 콘솔 인코딩 설정
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-    print("=" * 80)
-    print("🧪 Q-Max 선박 실시간 추적 테스트")
-    print("=" * 80)
-
-    asyncio.run(test_qmax_tracking())
+    main("🧪 Q-Max 선박 실시간 추적 테스트", test_qmax_tracking)